@@ -1,4 +1,67 @@
+import itertools
+import sys
 import threading
+import time
+
+class ShardedCounter:
+    """分片计数器 - 每个线程只写自己的分片，读取时再汇总"""
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._register_lock = threading.Lock()
+    
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = [0]
+            # 只有线程第一次写入时需要加锁登记分片
+            with self._register_lock:
+                self._shards.append(shard)
+        return shard
+    
+    def increment(self, amount=1):
+        self._shard()[0] += amount
+    
+    @property
+    def value(self):
+        return sum(shard[0] for shard in list(self._shards))
+
+class ShardedDict:
+    """分片字典 - 每个线程写入自己的字典分片，读取时合并：键按第一次写入的序号排列，值取最后一次写入"""
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._register_lock = threading.Lock()
+        # 全局写入序号，CPython 中 next() 是原子操作
+        self._sequence = itertools.count()
+    
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._register_lock:
+                self._shards.append(shard)
+        return shard
+    
+    def set(self, key, value):
+        shard = self._shard()
+        seq = next(self._sequence)
+        entry = shard.get(key)
+        # (首次写入序号, 最后写入序号, 值)：覆盖写入保留原来的位置，与普通 dict 的插入顺序一致
+        shard[key] = (seq if entry is None else entry[0], seq, value)
+    
+    def to_dict(self):
+        inserted = {}
+        latest = {}
+        for shard in list(self._shards):
+            for key, (first, last, value) in shard.copy().items():
+                if key not in inserted or first < inserted[key]:
+                    inserted[key] = first
+                if key not in latest or last > latest[key][0]:
+                    latest[key] = (last, value)
+        return {key: latest[key][1] for key in sorted(inserted, key=inserted.__getitem__)}
 
 class ThreadSafeSingleton:
     _instance = None
@@ -18,20 +81,44 @@ class ThreadSafeSingleton:
             with self._lock:
                 if not self._initialized:
                     self._initialized = True
-                    self.counter = 0
-                    self.data = {}
+                    # 序号由 itertools.count 发放，CPython 中 next() 是原子操作，无需加锁
+                    self._tickets = itertools.count(1)
+                    self._counter = ShardedCounter()
+                    self._data = ShardedDict()
+    
+    @property
+    def counter(self):
+        return self._counter.value
+    
+    @counter.setter
+    def counter(self, value):
+        # 整体赋值会换一个新的分片计数器，与同时进行的 increment_counter 之间不保证先后
+        counter = ShardedCounter()
+        counter.increment(value)
+        self._tickets = itertools.count(value + 1)
+        self._counter = counter
+    
+    @property
+    def data(self):
+        """合并后的数据副本；修改副本不会影响单例，写入请用 add_data 或整体赋值"""
+        return self._data.to_dict()
+    
+    @data.setter
+    def data(self, value):
+        data = ShardedDict()
+        for key, item in value.items():
+            data.set(key, item)
+        self._data = data
     
     def increment_counter(self):
-        with self._lock:
-            self.counter += 1
-            return self.counter
+        self._counter.increment()
+        return next(self._tickets)
     
     def add_data(self, key, value):
-        with self._lock:
-            self.data[key] = value
+        self._data.set(key, value)
     
     def get_data(self):
-        return self.data.copy()
+        return self._data.to_dict()
 
 def worker(singleton):
     # 模拟多线程操作
@@ -40,7 +127,47 @@ def worker(singleton):
         singleton.add_data(f"key_{count}", f"value_{count}")
         print(f"线程 {threading.current_thread().name} - 计数器: {count}")
 
-def main():
+def benchmark_contention(thread_counts=(1, 2, 4, 8, 16), operations=20000):
+    """对比全局锁与分片结构在不同线程数下的吞吐量"""
+    
+    def locked():
+        lock = threading.Lock()
+        state = {"counter": 0, "data": {}}
+        
+        def work(prefix):
+            for i in range(operations):
+                with lock:
+                    state["counter"] += 1
+                with lock:
+                    state["data"][f"{prefix}_{i}"] = i
+        return work, lambda: (state["counter"], len(state["data"]))
+    
+    def sharded():
+        counter = ShardedCounter()
+        data = ShardedDict()
+        
+        def work(prefix):
+            for i in range(operations):
+                counter.increment()
+                data.set(f"{prefix}_{i}", i)
+        return work, lambda: (counter.value, len(data.to_dict()))
+    
+    print(f"\n竞争基准测试 (每线程 {operations} 次计数 + 写入):")
+    for thread_count in thread_counts:
+        for label, setup in (("全局锁", locked), ("分片", sharded)):
+            work, result = setup()
+            threads = [threading.Thread(target=work, args=(n,)) for n in range(thread_count)]
+            start = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - start
+            counter, size = result()
+            print(f"  {thread_count:>2} 线程 | {label}: {thread_count * operations / elapsed:10,.0f} 次/秒, "
+                  f"计数 {counter}, 数据 {size} 条")
+
+def main(benchmark=False):
     # 创建单例实例
     singleton = ThreadSafeSingleton()
     
@@ -59,6 +186,10 @@ def main():
     print("\n最终结果:")
     print(f"计数器最终值: {singleton.counter}")
     print(f"数据内容: {singleton.get_data()}")
+    
+    if benchmark:
+        benchmark_contention()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # 竞争基准测试耗时较长，需加 --benchmark 运行
+    main(benchmark="--benchmark" in sys.argv[1:]) 
\ No newline at end of file
@@ -1,8 +1,14 @@
+import atexit
 import json
 import os
-from typing import Any, Dict
+import sys
+import tempfile
+from copy import deepcopy
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Set
 from functools import wraps
 import threading
+import time
 
 def singleton_decorator(cls):
     """单例装饰器"""
@@ -19,8 +25,8 @@ def singleton_decorator(cls):
     
     return get_instance
 
-class SingletonMeta(type):
-    """单例元类"""
+class GlobalLockSingletonMeta(type):
+    """单例元类（旧实现）- 所有单例类共享同一把锁，仅用于性能对比"""
     _instances = {}
     _lock = threading.Lock()
     
@@ -31,6 +37,81 @@ class SingletonMeta(type):
                     cls._instances[cls] = super().__call__(*args, **kwargs)
         return cls._instances[cls]
 
+class SingletonMeta(type):
+    """单例元类 - 每个类独立加锁，实例创建后的读取路径不加锁"""
+    _instances = {}
+    _locks = {}
+    
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        # 类创建时分配独立的锁，不同单例类的首次实例化互不阻塞
+        SingletonMeta._locks[cls] = threading.Lock()
+    
+    def __call__(cls, *args, **kwargs):
+        # 快速路径：实例已存在时直接返回，不获取任何锁
+        instance = SingletonMeta._instances.get(cls)
+        if instance is not None:
+            return instance
+        with SingletonMeta._locks[cls]:
+            instance = SingletonMeta._instances.get(cls)
+            if instance is None:
+                instance = super().__call__(*args, **kwargs)
+                SingletonMeta._instances[cls] = instance
+        return instance
+
+def _readonly(*args, **kwargs):
+    raise TypeError("配置快照中的值不可修改，请通过 set()/update() 修改配置")
+
+class FrozenDict(dict):
+    """只读字典 - 快照中嵌套的字典，repr 和 JSON 序列化与普通字典相同"""
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    
+    def __copy__(self):
+        return dict(self)
+    
+    def __deepcopy__(self, memo):
+        # 深拷贝得到可修改的普通值，便于在此基础上构造新配置
+        return {key: deepcopy(value, memo) for key, value in self.items()}
+    
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+class FrozenList(list):
+    """只读列表 - 快照中嵌套的列表，repr 和 JSON 序列化与普通列表相同"""
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = remove = pop = clear = sort = reverse = _readonly
+    
+    def __copy__(self):
+        return list(self)
+    
+    def __deepcopy__(self, memo):
+        return [deepcopy(value, memo) for value in self]
+    
+    def __reduce__(self):
+        return (list, (list(self),))
+
+def freeze(value: Any) -> Any:
+    """递归冻结字典和列表，已冻结的值原样返回"""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+class ConfigSnapshot(NamedTuple):
+    """配置快照 - 发布后不再修改，读取方无需加锁；嵌套的字典和列表也已冻结"""
+    version: int
+    data: Mapping[str, Any]
+
+def diff_keys(old: Mapping[str, Any], new: Mapping[str, Any]) -> Set[str]:
+    """返回新增、删除或值发生变化的键"""
+    changed = set(old.keys() - new.keys())
+    changed.update(key for key, value in new.items() if key not in old or old[key] != value)
+    return changed
+
 class ConfigManager(metaclass=SingletonMeta):
     """配置管理器 - 使用元类实现单例"""
     
@@ -40,57 +121,451 @@ class ConfigManager(metaclass=SingletonMeta):
         
         self._initialized = True
         self._config_file = config_file
-        self._config: Dict[str, Any] = {}
+        # 写时复制：每次修改发布一个新快照，读取只需取当前引用
+        self._snapshot = ConfigSnapshot(0, MappingProxyType({}))
+        self._subscribers: List[Callable[[ConfigSnapshot, Set[str]], None]] = []
         self._lock = threading.Lock()
+        # 延迟写入（write-behind）相关状态
+        self._flush_lock = threading.Lock()
+        self._write_behind = False
+        self._flush_interval = 1.0
+        self._flush_threshold = 1000
+        self._dirty_count = 0
+        self._write_count = 0
+        self._flush_requested = threading.Event()
+        self._stop_flusher = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        # 文件监视相关状态：(inode, mtime, size) 签名用于廉价地判断文件是否变化
+        self._file_signature: Optional[tuple] = None
+        # 最近一次读入或写出的文件内容，重新加载时与新内容比较，只合并磁盘上变化的键
+        self._file_data: Mapping[str, Any] = {}
+        self._reload_count = 0
+        self._stop_watcher = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
         self._load_config()
     
     def _load_config(self):
         """从文件加载配置"""
         if os.path.exists(self._config_file):
+            self._file_signature = self._stat_signature()
             with open(self._config_file, 'r', encoding='utf-8') as f:
-                self._config = json.load(f)
+                self._publish(json.load(f))
+            self._file_data = self._snapshot.data
         else:
-            self._config = {
+            self._publish({
                 "app_name": "示例应用",
                 "version": "1.0.0",
                 "settings": {
                     "debug": True,
                     "max_connections": 100
                 }
-            }
+            })
             self._save_config()
     
     def _save_config(self):
-        """保存配置到文件"""
-        with open(self._config_file, 'w', encoding='utf-8') as f:
-            json.dump(self._config, f, indent=4, ensure_ascii=False)
+        """保存配置到文件（调用方需持有 _flush_lock 和 _lock）"""
+        self._write_atomic(self._snapshot.data)
+        self._dirty_count = 0
+    
+    def _write_atomic(self, data: Mapping[str, Any]):
+        """先写临时文件再原子替换，写入中途崩溃不会留下半个配置文件"""
+        text = json.dumps(dict(data), indent=4, ensure_ascii=False)
+        directory = os.path.dirname(os.path.abspath(self._config_file))
+        fd, tmp_path = tempfile.mkstemp(prefix=".config-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._config_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        # 记录自身写入后的签名，文件监视不会把它当作外部修改
+        self._file_signature = self._stat_signature()
+        self._file_data = data
+        self._write_count += 1
+    
+    def _stat_signature(self) -> Optional[tuple]:
+        """返回配置文件的 (inode, mtime, size) 签名，文件不存在时返回 None"""
+        try:
+            st = os.stat(self._config_file)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    
+    def check_reload(self) -> Set[str]:
+        """文件被外部修改时增量重新加载，返回变化的键
+        
+        比较的是上次读写的文件内容与新内容，只合并磁盘上变化的键；尚未刷写的本地修改保留。
+        """
+        signature = self._stat_signature()
+        if signature is None or signature == self._file_signature:
+            return set()
+        # 持有刷写锁，避免把自身正在写入的文件误判为外部修改
+        with self._flush_lock:
+            try:
+                with open(self._config_file, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+            except (OSError, ValueError) as e:
+                # 外部进程可能正在写入，下次轮询再试
+                print(f"重新加载配置失败: {e}")
+                return set()
+            with self._lock:
+                if self._stat_signature() == self._file_signature:
+                    # 解析期间文件已被自身同步写入覆盖
+                    return set()
+                self._file_signature = signature
+                self._reload_count += 1
+                changed_on_disk = diff_keys(self._file_data, loaded)
+                self._file_data = loaded
+                current = self._snapshot.data
+                data = dict(current)
+                for key in changed_on_disk:
+                    if key in loaded:
+                        data[key] = loaded[key]
+                    else:
+                        data.pop(key, None)
+                changed = diff_keys(current, data)
+                if not changed:
+                    return set()
+                self._publish(data, changed)
+        return changed
+    
+    def _watch_loop(self, poll_interval: float):
+        """文件监视线程：定期检查文件签名"""
+        while not self._stop_watcher.wait(poll_interval):
+            self.check_reload()
+    
+    def start_watching(self, poll_interval: float = 0.5):
+        """开始监视配置文件，其他进程修改后自动增量重新加载"""
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._stop_watcher.clear()
+            self._watcher = threading.Thread(target=self._watch_loop, args=(poll_interval,),
+                                             name="config-watcher", daemon=True)
+            self._watcher.start()
+    
+    def stop_watching(self):
+        """停止监视配置文件"""
+        with self._lock:
+            watcher = self._watcher
+            self._watcher = None
+        if watcher is not None:
+            self._stop_watcher.set()
+            watcher.join()
+    
+    def _publish(self, data: Dict[str, Any], changed: Optional[Set[str]] = None):
+        """发布新快照并通知订阅者（调用方需持有 _lock，初始化时除外）"""
+        data = {key: freeze(value) for key, value in data.items()}
+        if changed is None:
+            changed = diff_keys(self._snapshot.data, data)
+        self._snapshot = ConfigSnapshot(self._snapshot.version + 1, MappingProxyType(data))
+        if not changed:
+            return
+        for callback in self._subscribers:
+            callback(self._snapshot, changed)
+    
+    def _mark_dirty(self, changes: int):
+        """记录未持久化的修改，达到阈值时唤醒后台刷写线程（调用方需持有 _lock）"""
+        self._dirty_count += changes
+        if self._dirty_count >= self._flush_threshold:
+            self._flush_requested.set()
+    
+    def _flush_loop(self):
+        """后台刷写线程：按时间间隔或修改数量阈值合并写入"""
+        while not self._stop_flusher.is_set():
+            self._flush_requested.wait(self._flush_interval)
+            self._flush_requested.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # 保留脏标记，下个周期重试
+                print(f"后台刷写配置失败: {e}")
+    
+    def enable_write_behind(self, flush_interval: float = 1.0, flush_threshold: int = 1000):
+        """开启延迟写入模式：修改只标记为脏，由后台线程合并为一次原子写入"""
+        with self._lock:
+            self._flush_interval = flush_interval
+            self._flush_threshold = flush_threshold
+            if self._write_behind:
+                return
+            self._write_behind = True
+            self._stop_flusher.clear()
+            self._flusher = threading.Thread(target=self._flush_loop, name="config-flusher", daemon=True)
+            self._flusher.start()
+        # 进程退出前刷写剩余修改
+        atexit.register(self.close)
+    
+    def disable_write_behind(self):
+        """关闭延迟写入模式，停止后台线程并刷写剩余修改"""
+        with self._lock:
+            if not self._write_behind:
+                return
+            self._write_behind = False
+            flusher = self._flusher
+            self._flusher = None
+        self._stop_flusher.set()
+        self._flush_requested.set()
+        flusher.join()
+        atexit.unregister(self.close)
+        self.flush()
+    
+    def close(self):
+        """关闭配置管理器，确保所有修改已写入磁盘"""
+        self.stop_watching()
+        self.disable_write_behind()
+        self.flush()
+    
+    def flush(self) -> bool:
+        """立即把未持久化的修改写入磁盘，返回是否发生了写入"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty_count:
+                    return False
+                snapshot = self._snapshot
+                pending = self._dirty_count
+                self._dirty_count = 0
+            try:
+                # 快照不可变，序列化无需持有 _lock
+                self._write_atomic(snapshot.data)
+            except BaseException:
+                with self._lock:
+                    self._dirty_count += pending
+                raise
+        return True
     
     def get(self, key: str, default: Any = None) -> Any:
-        """获取配置值"""
-        return self._config.get(key, default)
+        """获取配置值（无锁读取当前快照）"""
+        return self._snapshot.data.get(key, default)
+    
+    def snapshot(self) -> ConfigSnapshot:
+        """获取当前配置快照，同一快照内的多个值彼此一致"""
+        return self._snapshot
+    
+    def subscribe(self, callback: Callable[[ConfigSnapshot, Set[str]], None]):
+        """订阅配置变更，回调参数为新快照和变化的键
+        
+        回调在写锁内按版本顺序执行，不能在回调中再次修改配置。
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+    
+    def unsubscribe(self, callback: Callable[[ConfigSnapshot, Set[str]], None]):
+        """取消订阅配置变更"""
+        with self._lock:
+            self._subscribers.remove(callback)
     
     def set(self, key: str, value: Any):
         """设置配置值"""
-        with self._lock:
-            self._config[key] = value
-            self._save_config()
+        self.update({key: value})
     
     def update(self, config_dict: Dict[str, Any]):
         """批量更新配置"""
         with self._lock:
-            self._config.update(config_dict)
-            self._save_config()
+            old = self._snapshot.data
+            data = dict(old)
+            data.update(deepcopy(config_dict))
+            self._publish(data, {key for key in config_dict if key not in old or old[key] != data[key]})
+            if self._write_behind:
+                self._mark_dirty(len(config_dict))
+                return
+            self._dirty_count += len(config_dict)
+        # 同步模式也经由 flush 在 _flush_lock 下写盘，正在进行的刷写不会用旧快照覆盖这次写入
+        self.flush()
     
     def reset(self):
         """重置配置"""
-        with self._lock:
+        # 先取刷写锁，避免后台线程用旧快照覆盖重置后的文件
+        with self._flush_lock, self._lock:
             # 删除配置文件
             if os.path.exists(self._config_file):
                 os.remove(self._config_file)
             # 重新加载默认配置
             self._load_config()
 
-def main():
+def check_interrupted_flush(config: ConfigManager) -> bool:
+    """模拟刷写在临时文件写完、替换配置文件之前中断：磁盘上的旧文件保持完整，修改仍待刷写"""
+    with open(config._config_file, 'rb') as f:
+        before = f.read()
+    
+    def interrupted_replace(src, dst):
+        raise OSError("模拟在替换配置文件前中断")
+    
+    replace, os.replace = os.replace, interrupted_replace
+    try:
+        config.update({"request_count": -1})
+        config.flush()
+    except OSError:
+        pass
+    else:
+        return False
+    finally:
+        os.replace = replace
+    with open(config._config_file, 'rb') as f:
+        intact = f.read() == before
+    leftovers = [n for n in os.listdir(os.path.dirname(os.path.abspath(config._config_file)))
+                 if n.startswith(".config-")]
+    return intact and not leftovers and config._dirty_count > 0
+
+def demo_write_behind(config: ConfigManager, writes: int = 10000, sync_writes: int = 200):
+    """演示延迟写入：对比逐次写盘与合并写盘，并验证写入失败时磁盘文件保持完整"""
+    print("\n延迟写入对比:")
+    start_count = config._write_count
+    start = time.perf_counter()
+    for i in range(sync_writes):
+        config.set("request_count", i)
+    elapsed = time.perf_counter() - start
+    print(f"  同步模式: {sync_writes} 次修改, 写盘 {config._write_count - start_count} 次, "
+          f"{elapsed * 1000:.2f} ms")
+    
+    config.enable_write_behind(flush_interval=60.0, flush_threshold=writes * 2)
+    start_count = config._write_count
+    start = time.perf_counter()
+    for i in range(writes):
+        config.set("request_count", i)
+    config.flush()
+    elapsed = time.perf_counter() - start
+    print(f"  延迟写入: {writes} 次修改, 写盘 {config._write_count - start_count} 次, "
+          f"{elapsed * 1000:.2f} ms")
+    
+    with open(config._config_file, 'r', encoding='utf-8') as f:
+        on_disk = json.load(f)
+    print(f"  磁盘中的 request_count: {on_disk['request_count']}")
+    
+    # 模拟写入中途失败：不可序列化的值会让刷写中断
+    config.set("broken", object())
+    try:
+        config.flush()
+    except TypeError as e:
+        print(f"  刷写失败: {e}")
+    with open(config._config_file, 'r', encoding='utf-8') as f:
+        intact = json.load(f)
+    leftovers = [n for n in os.listdir(os.path.dirname(os.path.abspath(config._config_file)))
+                 if n.startswith(".config-")]
+    print(f"  失败后磁盘文件仍完整: {intact == on_disk}, 残留临时文件: {len(leftovers)}")
+    
+    config.set("broken", "已修复")
+    print(f"  替换文件前中断后磁盘文件仍完整: {check_interrupted_flush(config)}")
+    config.disable_write_behind()
+    with open(config._config_file, 'r', encoding='utf-8') as f:
+        print(f"  关闭延迟写入后已刷写: {json.load(f)['broken']}")
+
+def demo_file_watch(config: ConfigManager, poll_interval: float = 0.05):
+    """演示文件监视：模拟其他进程修改配置文件后自动增量重新加载"""
+    print("\n文件监视重新加载:")
+    reloaded = threading.Event()
+    
+    def on_change(snapshot, changed):
+        print(f"  版本 {snapshot.version} 检测到外部修改: {sorted(changed)}")
+        reloaded.set()
+    
+    config.subscribe(on_change)
+    config.start_watching(poll_interval)
+    
+    # 模拟另一个进程直接改写配置文件
+    with open(config._config_file, 'r', encoding='utf-8') as f:
+        external = json.load(f)
+    external["app_name"] = "外部修改的应用"
+    external.pop("broken", None)
+    with open(config._config_file, 'w', encoding='utf-8') as f:
+        json.dump(external, f, indent=4, ensure_ascii=False)
+    
+    reloaded.wait(timeout=5)
+    config.unsubscribe(on_change)
+    print(f"  应用名称: {config.get('app_name')}, broken 是否存在: {config.get('broken') is not None}")
+    
+    # 文件未变化时只做一次 stat，不会重新解析
+    reload_count = config._reload_count
+    time.sleep(poll_interval * 4)
+    print(f"  文件未变化期间的重新解析次数: {config._reload_count - reload_count}")
+    config.stop_watching()
+
+def benchmark_snapshot_reads(config: ConfigManager, reader_counts=(1, 4, 8), reads: int = 50000):
+    """多线程读写吞吐：读线程通过快照校验批量更新的一致性"""
+    print("\n快照读写吞吐:")
+    config.enable_write_behind(flush_interval=60.0, flush_threshold=10 ** 9)
+    for reader_count in reader_counts:
+        stop = threading.Event()
+        writes = [0]
+        torn = [0]
+        
+        def writer():
+            i = 0
+            while not stop.is_set():
+                i += 1
+                # 同一批次内的两个键必须同时可见
+                config.update({"pair_a": i, "pair_b": i})
+            writes[0] = i
+        
+        def reader():
+            for _ in range(reads):
+                data = config.snapshot().data
+                if data.get("pair_a") != data.get("pair_b"):
+                    torn[0] += 1
+        
+        readers = [threading.Thread(target=reader) for _ in range(reader_count)]
+        writer_thread = threading.Thread(target=writer)
+        start = time.perf_counter()
+        writer_thread.start()
+        for t in readers:
+            t.start()
+        for t in readers:
+            t.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        writer_thread.join()
+        print(f"  {reader_count} 读线程 + 1 写线程: 读 {reader_count * reads / elapsed:12,.0f} 次/秒, "
+              f"写 {writes[0] / elapsed:10,.0f} 次/秒, 不一致读取 {torn[0]} 次")
+    config.disable_write_behind()
+
+def benchmark_singleton_lookup(thread_counts=(1, 8, 64), class_count=16, lookups=2000, init_delay=0.001):
+    """对比三种单例实现在多线程下的首次创建与并发查找耗时"""
+    
+    def make_meta_classes(meta):
+        def slow_init(self):
+            # 模拟耗时的初始化（如读取配置、建立连接）
+            time.sleep(init_delay)
+        return [meta(f"Service{i}", (), {"__init__": slow_init}) for i in range(class_count)]
+    
+    def make_decorated_classes():
+        def slow_init(self):
+            time.sleep(init_delay)
+        return [singleton_decorator(type(f"Service{i}", (), {"__init__": slow_init}))
+                for i in range(class_count)]
+    
+    implementations = {
+        "全局锁元类": lambda: make_meta_classes(GlobalLockSingletonMeta),
+        "分类锁元类": lambda: make_meta_classes(SingletonMeta),
+        "单例装饰器": make_decorated_classes,
+    }
+    
+    print(f"\n单例查找基准测试 ({class_count} 个单例类, 每线程 {lookups} 次查找):")
+    for thread_count in thread_counts:
+        for label, factory in implementations.items():
+            classes = factory()
+            barrier = threading.Barrier(thread_count)
+            
+            def worker(offset):
+                barrier.wait()
+                # 每个线程从不同的类开始，模拟启动阶段并发创建不同单例
+                for i in range(lookups):
+                    classes[(offset + i) % class_count]()
+            
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(thread_count)]
+            start = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - start
+            total = thread_count * lookups
+            print(f"  {thread_count:>3} 线程 | {label}: {elapsed * 1000:8.2f} ms, "
+                  f"{total / elapsed:12,.0f} 次/秒")
+
+def main(benchmark: bool = False):
     # 创建配置管理器实例
     config1 = ConfigManager()
     config2 = ConfigManager()
@@ -122,11 +597,34 @@ def main():
     # 验证第二个实例也被更新
     print(f"config2的应用名称: {config2.get('app_name')}")
     
+    if benchmark:
+        # 延迟写入
+        demo_write_behind(config1)
+        
+        # 订阅配置变更
+        def on_change(snapshot, changed):
+            print(f"  版本 {snapshot.version} 变更: {sorted(changed)}")
+        
+        print("\n配置变更通知:")
+        config1.subscribe(on_change)
+        config1.set("app_name", "订阅演示")
+        config1.update({"version": "1.1.0", "app_name": "订阅演示"})
+        config1.unsubscribe(on_change)
+        
+        demo_file_watch(config1)
+        
+        benchmark_snapshot_reads(config1)
+    
     # 重置配置
     config1.reset()
     print("\n重置后的配置:")
     print(f"应用名称: {config1.get('app_name')}")
     print(f"设置: {config1.get('settings')}")
+    
+    if benchmark:
+        # 性能对比
+        benchmark_singleton_lookup()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # 演示和性能测试耗时较长，需加 --benchmark 运行
+    main(benchmark="--benchmark" in sys.argv[1:]) 
\ No newline at end of file
@@ -1,4 +1,9 @@
+import itertools
+import sys
 import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from functools import wraps
 
 def singleton_decorator(cls):
@@ -17,40 +22,234 @@ def singleton_decorator(cls):
     
     return get_instance
 
+class FakeBackend:
+    """进程内模拟的数据库后端 - 用 sleep 模拟每次查询的网络与执行延迟"""
+    
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self._ids = itertools.count(1)
+    
+    def open(self):
+        """打开一条底层连接"""
+        return RawConnection(next(self._ids), self.latency)
+
+class RawConnection:
+    """模拟的底层连接"""
+    
+    def __init__(self, connection_id, latency):
+        self.connection_id = connection_id
+        self.latency = latency
+        self.alive = True
+    
+    def ping(self):
+        """健康检查"""
+        return self.alive
+    
+    def run(self, query):
+        if not self.alive:
+            raise ConnectionError(f"连接 #{self.connection_id} 已断开")
+        if self.latency:
+            time.sleep(self.latency)
+        return f"查询结果: {query} 执行成功"
+    
+    def close(self):
+        self.alive = False
+
+class PooledConnection:
+    """连接池中的连接 - 记录查询次数与最近使用时间"""
+    
+    def __init__(self, raw):
+        self.raw = raw
+        self.query_count = 0
+        self.last_used = time.monotonic()
+    
+    def execute(self, query):
+        result = self.raw.run(query)
+        self.query_count += 1
+        return result
+
+class ConnectionPool:
+    """有界连接池 - 按需创建连接，支持借出超时、健康检查和空闲回收"""
+    
+    def __init__(self, backend, size=4, checkout_timeout=5.0, idle_timeout=60.0):
+        self._backend = backend
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self.idle_timeout = idle_timeout
+        self._idle = deque()
+        self._in_use = set()  # 已借出、尚未归还的连接
+        self._created = 0
+        self._closed = False
+        self._retired_queries = 0
+        self._condition = threading.Condition()
+    
+    def acquire(self, timeout=None):
+        """借出一条连接，超时未获得时抛出 TimeoutError"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("连接池已关闭")
+                while self._idle:
+                    conn = self._idle.pop()
+                    if conn.raw.ping():
+                        self._in_use.add(conn)
+                        return conn
+                    self._discard(conn)
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"{timeout} 秒内未能借出连接")
+                self._condition.wait(remaining)
+        # 建立连接可能较慢，不在锁内进行
+        try:
+            conn = PooledConnection(self._backend.open())
+        except BaseException:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._in_use.add(conn)
+        return conn
+    
+    def release(self, conn):
+        """归还连接，断开的连接直接丢弃；不是从本池借出或已经归还的连接抛出 ValueError"""
+        with self._condition:
+            if conn not in self._in_use:
+                raise ValueError("该连接不是从本连接池借出的，或已经归还")
+            self._in_use.remove(conn)
+            conn.last_used = time.monotonic()
+            if self._closed or not conn.raw.ping():
+                self._discard(conn)
+            else:
+                self._idle.append(conn)
+            self._condition.notify()
+    
+    @contextmanager
+    def connection(self, timeout=None):
+        """以上下文管理器方式借出并自动归还连接"""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+    
+    def execute(self, query, timeout=None):
+        """借出一条连接执行查询"""
+        with self.connection(timeout) as conn:
+            return conn.execute(query)
+    
+    def health_check(self):
+        """检查所有空闲连接，丢弃已断开的连接，返回丢弃数量"""
+        with self._condition:
+            healthy, dropped = deque(), []
+            for conn in self._idle:
+                (healthy if conn.raw.ping() else dropped).append(conn)
+            for conn in dropped:
+                self._discard(conn)
+            self._idle = healthy
+            if dropped:
+                self._condition.notify(len(dropped))
+        return len(dropped)
+    
+    def evict_idle(self, now=None):
+        """关闭空闲超过 idle_timeout 的连接，返回回收数量"""
+        now = time.monotonic() if now is None else now
+        with self._condition:
+            # 最久未使用的连接在队首
+            evicted = 0
+            while self._idle and now - self._idle[0].last_used >= self.idle_timeout:
+                self._discard(self._idle.popleft())
+                evicted += 1
+            if evicted:
+                self._condition.notify(evicted)
+        return evicted
+    
+    def _discard(self, conn):
+        # 调用方需持有 _condition
+        conn.raw.close()
+        self._created -= 1
+        self._retired_queries += conn.query_count
+    
+    def close(self):
+        """关闭连接池及所有空闲连接"""
+        with self._condition:
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.pop())
+            self._condition.notify_all()
+    
+    def stats(self):
+        """连接池统计信息，包含每条已打开连接（空闲和借出中）的查询次数"""
+        with self._condition:
+            per_connection = {conn.raw.connection_id: conn.query_count
+                              for conn in itertools.chain(self._idle, self._in_use)}
+            return {
+                "size": self.size,
+                "open": self._created,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "queries": self._retired_queries + sum(per_connection.values()),
+                "per_connection": per_connection,
+            }
+
 @singleton_decorator
 class DatabaseConnection:
     """数据库连接类 - 使用装饰器实现单例"""
     
-    def __init__(self, host="localhost", port=5432, database="mydb"):
+    def __init__(self, host="localhost", port=5432, database="mydb", pool_size=4, backend=None):
         print(f"创建数据库连接: {host}:{port}/{database}")
         self.host = host
         self.port = port
         self.database = database
+        self.pool_size = pool_size
         self.is_connected = False
         self._connection_count = 0
+        self._backend = backend or FakeBackend()
+        self._pool = None
+        # 保护 connect/disconnect，避免并发调用创建两个连接池
+        self._state_lock = threading.Lock()
+    
+    @property
+    def pool(self):
+        """当前连接池，未连接时为 None"""
+        return self._pool
     
     def connect(self):
         """连接数据库"""
-        if not self.is_connected:
-            print(f"连接到数据库 {self.host}:{self.port}/{self.database}")
-            self.is_connected = True
-            self._connection_count += 1
-        else:
-            print("数据库已经连接")
+        with self._state_lock:
+            if not self.is_connected:
+                print(f"连接到数据库 {self.host}:{self.port}/{self.database}")
+                # 单例对外保持一个入口，内部由连接池提供多条连接
+                self._pool = ConnectionPool(self._backend, size=self.pool_size)
+                self.is_connected = True
+                self._connection_count += 1
+            else:
+                print("数据库已经连接")
     
     def disconnect(self):
         """断开数据库连接"""
-        if self.is_connected:
-            print("断开数据库连接")
-            self.is_connected = False
-        else:
-            print("数据库未连接")
+        with self._state_lock:
+            if self.is_connected:
+                print("断开数据库连接")
+                self._pool.close()
+                self._pool = None
+                self.is_connected = False
+            else:
+                print("数据库未连接")
     
     def execute_query(self, query):
         """执行查询"""
-        if self.is_connected:
+        # 只读取一次连接池引用，并发的 disconnect 不会让它在检查之后变成 None
+        pool = self._pool
+        if pool is not None:
             print(f"执行查询: {query}")
-            return f"查询结果: {query} 执行成功"
+            # 查询期间连接池被关闭时，acquire 抛出 RuntimeError("连接池已关闭")
+            return pool.execute(query)
         else:
             print("请先连接数据库")
             return None
@@ -62,10 +261,55 @@ class DatabaseConnection:
             "port": self.port,
             "database": self.database,
             "is_connected": self.is_connected,
-            "connection_count": self._connection_count
+            "connection_count": self._connection_count,
+            "pool_size": self.pool_size
         }
 
-def main():
+def benchmark_pool_throughput(pool_sizes=(1, 4, 16), threads=16, queries_per_thread=50, latency=0.002):
+    """对比单连接（池大小为 1）与多连接池在并发查询下的吞吐量"""
+    print(f"\n连接池吞吐量 ({threads} 线程, 每线程 {queries_per_thread} 次查询, 单次延迟 {latency * 1000:.0f} ms):")
+    for size in pool_sizes:
+        pool = ConnectionPool(FakeBackend(latency), size=size, checkout_timeout=30.0)
+        
+        def worker():
+            for i in range(queries_per_thread):
+                pool.execute(f"SELECT {i}")
+        
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        start = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - start
+        stats = pool.stats()
+        print(f"  池大小 {size:>2}: {stats['queries'] / elapsed:8,.0f} 次/秒, "
+              f"各连接查询数 {sorted(stats['per_connection'].values(), reverse=True)}")
+        pool.close()
+
+def demo_pool_maintenance():
+    """演示借出超时、健康检查与空闲回收"""
+    print("\n连接池维护:")
+    pool = ConnectionPool(FakeBackend(), size=2, checkout_timeout=0.05, idle_timeout=10.0)
+    first = pool.acquire()
+    second = pool.acquire()
+    try:
+        pool.acquire()
+    except TimeoutError as e:
+        print(f"  借出超时: {e}")
+    
+    first.execute("SELECT 1")
+    pool.release(first)
+    pool.release(second)
+    print(f"  归还后: {pool.stats()}")
+    
+    # 模拟一条连接在空闲期间被服务端断开
+    second.raw.close()
+    print(f"  健康检查丢弃: {pool.health_check()} 条")
+    print(f"  空闲回收: {pool.evict_idle(now=time.monotonic() + 60)} 条, 剩余 {pool.stats()}")
+    pool.close()
+
+def main(benchmark=False):
     print("=== 装饰器单例模式示例 ===\n")
     
     # 创建第一个数据库连接实例
@@ -102,6 +346,11 @@ def main():
     print(f"\n7. 断开连接:")
     db2.disconnect()
     print(f"db1 连接状态: {db1.is_connected}")
+    
+    if benchmark:
+        demo_pool_maintenance()
+        benchmark_pool_throughput()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # 连接池维护演示和吞吐量测试需加 --benchmark 运行
+    main(benchmark="--benchmark" in sys.argv[1:]) 
\ No newline at end of file
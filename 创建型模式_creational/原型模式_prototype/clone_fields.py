@@ -0,0 +1,35 @@
+"""原型示例共用的快速克隆工具，供 example-1/2/3 导入"""
+from copy import deepcopy
+
+def clone_fields(immutable=(), shallow=(), deep=(), nested=()):
+    """类装饰器：按字段类型生成专用的 _fast_clone 方法，避免整体 deepcopy 的 memo 字典与反射开销
+    
+    immutable: 不可变字段，直接复用引用
+    shallow:   只包含不可变值的 dict/list 字段，浅拷贝容器
+    deep:      值可能可变的字段，单独 deepcopy
+    nested:    由原型对象组成的列表字段，逐个调用 clone()
+    未登记的属性按名称识别，回退到 deepcopy
+    """
+    known = (*immutable, *shallow, *deep, *nested)
+    items = [f"{name!r}: src[{name!r}]" for name in immutable]
+    items += [f"{name!r}: src[{name!r}].copy()" for name in shallow]
+    items += [f"{name!r}: _deepcopy(src[{name!r}])" for name in deep]
+    items += [f"{name!r}: [item.clone() for item in src[{name!r}]]" for name in nested]
+    source = (
+        "def _fast_clone(self):\n"
+        "    src = self.__dict__\n"
+        "    new = _new(type(self))\n"
+        f"    new.__dict__ = {{{', '.join(items)}}}\n"
+        "    if src.keys() != _known:\n"
+        "        for key, value in src.items():\n"
+        "            if key not in _known:\n"
+        "                new.__dict__[key] = _deepcopy(value)\n"
+        "    return new\n"
+    )
+    
+    def decorate(cls):
+        namespace = {"_new": object.__new__, "_known": frozenset(known), "_deepcopy": deepcopy}
+        exec(source, namespace)
+        cls._fast_clone = namespace["_fast_clone"]
+        return cls
+    return decorate
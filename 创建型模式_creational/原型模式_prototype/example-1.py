@@ -1,5 +1,11 @@
 from copy import deepcopy
+import sys
+import time
+import tracemalloc
 
+from clone_fields import clone_fields
+
+@clone_fields(immutable=("name", "color", "price"))
 class Stationery:
     def __init__(self, name, color, price):
         self.name = name
@@ -7,11 +13,35 @@ class Stationery:
         self.price = price
     
     def clone(self):
-        return deepcopy(self)
+        return self._fast_clone()
+    
+    def __str__(self):
+        return f"{self.name} - 颜色: {self.color}, 价格: {self.price}元"
+
+class SlottedStationery:
+    """使用 __slots__ 的紧凑版文具，实例不再携带 __dict__，适合海量对象"""
+    __slots__ = ("name", "color", "price")
+    
+    def __init__(self, name, color, price):
+        self.name = name
+        self.color = color
+        self.price = price
+    
+    def clone(self):
+        return SlottedStationery(self.name, self.color, self.price)
     
     def __str__(self):
         return f"{self.name} - 颜色: {self.color}, 价格: {self.price}元"
 
+def measure_memory(prototype, n):
+    """克隆 n 个对象，返回占用的内存字节数"""
+    tracemalloc.start()
+    items = [prototype.clone() for _ in range(n)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return current
+
 # 使用示例
 if __name__ == "__main__":
     # 创建一个铅笔原型
@@ -28,3 +58,23 @@ if __name__ == "__main__":
     print("原始铅笔:", pencil_prototype)
     print("红色铅笔:", pencil1)
     print("高价铅笔:", pencil2)
+    
+    # 以下性能对比耗时较长，需加 --benchmark 运行
+    if "--benchmark" in sys.argv[1:]:
+        # 克隆性能对比
+        n = 100000
+        start = time.perf_counter()
+        slow = [deepcopy(pencil_prototype) for _ in range(n)]
+        deepcopy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        fast = [pencil_prototype.clone() for _ in range(n)]
+        clone_time = time.perf_counter() - start
+        print(f"\n克隆 {n} 次: deepcopy {deepcopy_time * 1000:.1f} ms, "
+              f"专用克隆 {clone_time * 1000:.1f} ms, 加速 {deepcopy_time / clone_time:.1f} 倍")
+        print(f"结果一致: {str(slow[-1]) == str(fast[-1])}")
+        
+        # 内存对比
+        n = 1000000
+        for label, prototype in (("普通", pencil_prototype), ("__slots__", SlottedStationery("铅笔", "黑色", 2.5))):
+            size = measure_memory(prototype, n)
+            print(f"{n} 个{label}文具: {size / 1024 / 1024:.1f} MB, 每个 {size / n:.0f} 字节")
@@ -1,6 +1,13 @@
 from copy import deepcopy
 from abc import ABC, abstractmethod
+import sys
+import time
+import tracemalloc
+from types import MappingProxyType
 
+from clone_fields import clone_fields
+
+@clone_fields(immutable=("brand", "model", "price"), deep=("specs",))
 class ElectronicDevice(ABC):
     def __init__(self, brand, model, price):
         self.brand = brand
@@ -26,7 +33,7 @@ class Smartphone(ElectronicDevice):
         self.set_spec("屏幕尺寸", "6.1英寸")
     
     def clone(self):
-        return deepcopy(self)
+        return self._fast_clone()
 
 class Laptop(ElectronicDevice):
     def __init__(self, brand, model, price):
@@ -35,7 +42,102 @@ class Laptop(ElectronicDevice):
         self.set_spec("内存", "16GB")
     
     def clone(self):
-        return deepcopy(self)
+        return self._fast_clone()
+
+class SpecLayout:
+    """规格键布局：按插入顺序记录键名，键序列相同的设备共享同一个布局对象"""
+    __slots__ = ("keys", "index", "_transitions")
+    
+    def __init__(self, keys=()):
+        self.keys = keys
+        self.index = {key: i for i, key in enumerate(keys)}
+        self._transitions = {}
+    
+    def with_key(self, key):
+        """返回追加一个键后的布局，相同的追加路径总是得到同一个布局"""
+        layout = self._transitions.get(key)
+        if layout is None:
+            layout = self._transitions[key] = SpecLayout(self.keys + (sys.intern(key),))
+        return layout
+
+EMPTY_SPEC_LAYOUT = SpecLayout()
+
+class SlottedElectronicDevice(ABC):
+    """紧凑版电子产品：__slots__ 去掉实例字典，规格值存放在按共享布局索引的元组中"""
+    __slots__ = ("brand", "model", "price", "_layout", "_values")
+    
+    def __init__(self, brand, model, price):
+        self.brand = brand
+        self.model = model
+        self.price = price
+        self._layout = EMPTY_SPEC_LAYOUT
+        self._values = ()
+    
+    @abstractmethod
+    def clone(self):
+        pass
+    
+    def _copy(self):
+        new = object.__new__(type(self))
+        new.brand = self.brand
+        new.model = self.model
+        new.price = self.price
+        # 布局和值元组都不可变，可以直接共享
+        new._layout = self._layout
+        new._values = self._values
+        return new
+    
+    @property
+    def specs(self):
+        """规格的只读视图（副本），直接写入会抛出 TypeError，修改请用 set_spec"""
+        return MappingProxyType(dict(zip(self._layout.keys, self._values)))
+    
+    def set_spec(self, key, value):
+        i = self._layout.index.get(key)
+        if i is None:
+            self._layout = self._layout.with_key(key)
+            self._values += (value,)
+        else:
+            self._values = self._values[:i] + (value,) + self._values[i + 1:]
+    
+    def __str__(self):
+        specs_str = ", ".join([f"{k}: {v}" for k, v in zip(self._layout.keys, self._values)])
+        return f"{self.brand} {self.model} - 价格: {self.price}元, 规格: {specs_str}"
+
+class SlottedSmartphone(SlottedElectronicDevice):
+    __slots__ = ()
+    
+    def __init__(self, brand, model, price):
+        super().__init__(brand, model, price)
+        self.set_spec("操作系统", "Android")
+        self.set_spec("屏幕尺寸", "6.1英寸")
+    
+    def clone(self):
+        return self._copy()
+
+class SlottedLaptop(SlottedElectronicDevice):
+    __slots__ = ()
+    
+    def __init__(self, brand, model, price):
+        super().__init__(brand, model, price)
+        self.set_spec("处理器", "Intel i7")
+        self.set_spec("内存", "16GB")
+    
+    def clone(self):
+        return self._copy()
+
+def measure_memory(prototype, n):
+    """克隆 n 个对象并各自设置一项规格，返回占用的内存字节数"""
+    tracemalloc.start()
+    items = []
+    for i in range(n):
+        item = prototype.clone()
+        item.set_spec("颜色", "黑色" if i % 2 else "白色")
+        items.append(item)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return current
 
 # 使用示例
 if __name__ == "__main__":
@@ -58,3 +160,27 @@ if __name__ == "__main__":
     print("克隆手机:", phone1)
     print("\n原始笔记本:", laptop_prototype)
     print("克隆笔记本:", laptop1)
+    
+    # 以下性能对比耗时较长，需加 --benchmark 运行
+    if "--benchmark" in sys.argv[1:]:
+        # 克隆性能对比
+        n = 100000
+        for prototype in (phone_prototype, laptop_prototype):
+            start = time.perf_counter()
+            slow = [deepcopy(prototype) for _ in range(n)]
+            deepcopy_time = time.perf_counter() - start
+            start = time.perf_counter()
+            fast = [prototype.clone() for _ in range(n)]
+            clone_time = time.perf_counter() - start
+            print(f"\n{type(prototype).__name__} 克隆 {n} 次: deepcopy {deepcopy_time * 1000:.1f} ms, "
+                  f"专用克隆 {clone_time * 1000:.1f} ms, 加速 {deepcopy_time / clone_time:.1f} 倍, "
+                  f"结果一致: {str(slow[-1]) == str(fast[-1])}")
+        
+        # 内存对比
+        n = 1000000
+        slotted_phone = SlottedSmartphone("小米", "13", 3999)
+        slotted_phone.set_spec("电池容量", "4500mAh")
+        print(f"\n紧凑版输出一致: {str(slotted_phone) == str(phone_prototype)}")
+        for label, prototype in (("普通", phone_prototype), ("__slots__", slotted_phone)):
+            size = measure_memory(prototype, n)
+            print(f"{n} 台{label}手机: {size / 1024 / 1024:.1f} MB, 每台 {size / n:.0f} 字节")
@@ -1,22 +1,83 @@
 from copy import deepcopy
+import gc
+import mmap
+import multiprocessing
+import os
+import struct
+import sys
+import tempfile
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from collections.abc import MutableSequence
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union
+import time
+import tracemalloc
 
+from clone_fields import clone_fields
+
+@clone_fields(immutable=("name", "material", "_dimensions", "_dimensions_shared"))
 class FurnitureComponent(ABC):
     def __init__(self, name: str, material: str):
         self.name = name
         self.material = material
-        self.dimensions = {}
+        self._dimensions: Dict[str, float] = {}
+        self._dimensions_shared = False
     
     @abstractmethod
     def clone(self):
         pass
     
+    def _share(self):
+        """标记可变部分为共享状态，之后由先修改的一方负责复制
+        
+        尺寸字典可能已经通过 dimensions 交给调用方，第一次共享前先换成副本，调用方手里的引用不会影响克隆。
+        """
+        if not self._dimensions_shared:
+            self._dimensions = dict(self._dimensions)
+            self._dimensions_shared = True
+    
+    @classmethod
+    def _from_parts(cls, name: str, material: str, dimensions: Dict[str, float],
+                    components: List["FurnitureComponent"]):
+        """不经过 __init__，直接用各字段构造组件，供模板存储解码使用"""
+        obj = object.__new__(cls)
+        obj.name = name
+        obj.material = material
+        obj._dimensions = dimensions
+        obj._dimensions_shared = False
+        return obj
+    
+    def _cow_clone(self):
+        """写时复制克隆：只复制对象外壳，dimensions 等可变部分在首次修改时才复制"""
+        self._share()
+        return self._fast_clone()
+    
+    def _own_dimensions(self):
+        if self._dimensions_shared:
+            self._dimensions = dict(self._dimensions)
+            self._dimensions_shared = False
+    
+    def _dimension_items(self):
+        """只读地遍历尺寸，不触发写时复制"""
+        return self._dimensions.items()
+    
+    @property
+    def dimensions(self) -> Dict[str, float]:
+        """可直接修改的尺寸字典，与其他克隆共享时先复制一份"""
+        self._own_dimensions()
+        return self._dimensions
+    
+    @dimensions.setter
+    def dimensions(self, value: Dict[str, float]):
+        self._dimensions = value
+        self._dimensions_shared = False
+    
     def set_dimension(self, dimension: str, value: float):
-        self.dimensions[dimension] = value
+        self._own_dimensions()
+        self._dimensions[dimension] = value
     
     def __str__(self):
-        dims = ", ".join([f"{k}: {v}cm" for k, v in self.dimensions.items()])
+        dims = ", ".join([f"{k}: {v}cm" for k, v in self._dimensions.items()])
         return f"{self.name} ({self.material}) - 尺寸: {dims}"
 
 class Drawer(FurnitureComponent):
@@ -27,7 +88,7 @@ class Drawer(FurnitureComponent):
         self.set_dimension("高度", 15)
     
     def clone(self):
-        return deepcopy(self)
+        return self._cow_clone()
 
 class Door(FurnitureComponent):
     def __init__(self, name: str, material: str):
@@ -37,29 +98,500 @@ class Door(FurnitureComponent):
         self.set_dimension("厚度", 2)
     
     def clone(self):
-        return deepcopy(self)
+        return self._cow_clone()
+
+class ComponentList(MutableSequence):
+    """柜子组件的列表视图：与普通列表用法相同，取出的组件都归本柜子独占
+    
+    与其他柜子共享的组件在第一次被取出时复制，因此通过视图修改组件不会影响原型或其他克隆。
+    """
+    __slots__ = ("_owner",)
+    
+    def __init__(self, owner: "Cabinet"):
+        self._owner = owner
+    
+    def __len__(self) -> int:
+        return len(self._owner._components)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._owner.component(i) for i in range(len(self))[index]]
+        return self._owner.component(index)
+    
+    def __setitem__(self, index, value):
+        self._owner._replace_components(index, value)
+    
+    def __delitem__(self, index):
+        self._owner._replace_components(index, [] if isinstance(index, slice) else None)
+    
+    def insert(self, index: int, component: FurnitureComponent):
+        self._owner._insert_component(index, component)
+    
+    def __repr__(self):
+        return f"ComponentList({self._owner._components!r})"
 
+@clone_fields(immutable=("name", "material", "_dimensions", "_dimensions_shared",
+                         "_components", "_components_shared", "_owned_components"))
 class Cabinet(FurnitureComponent):
     def __init__(self, name: str, material: str):
         super().__init__(name, material)
         self.set_dimension("宽度", 120)
         self.set_dimension("深度", 60)
         self.set_dimension("高度", 200)
-        self.components: List[FurnitureComponent] = []
+        self._components: List[FurnitureComponent] = []
+        self._components_shared = False
+        # 已归本柜子独占、可以直接修改的组件（按 id 记录）
+        self._owned_components: Set[int] = set()
+    
+    @property
+    def components(self) -> ComponentList:
+        """组件列表视图，取出的组件可以直接修改"""
+        return ComponentList(self)
+    
+    @components.setter
+    def components(self, value: Sequence[FurnitureComponent]):
+        if isinstance(value, ComponentList) and value._owner is self:
+            return
+        self._components = list(value)
+        self._components_shared = False
+        self._owned_components = {id(component) for component in self._components}
+    
+    def _share(self):
+        super()._share()
+        if self._owned_components:
+            # 独占的组件是调用方传入或经 component() 取出的，调用方可能仍持有引用并直接修改；
+            # 第一次共享前把它们换成写时复制的克隆，之后的克隆与原型都不再受这些引用影响
+            owned = self._owned_components
+            self._components = [child.clone() if id(child) in owned else child for child in self._components]
+        self._components_shared = True
+        self._owned_components = set()
+    
+    @classmethod
+    def _from_parts(cls, name: str, material: str, dimensions: Dict[str, float],
+                    components: List[FurnitureComponent]):
+        obj = super()._from_parts(name, material, dimensions, components)
+        obj._components = components
+        obj._components_shared = False
+        obj._owned_components = {id(component) for component in components}
+        return obj
+    
+    def _own_components(self):
+        """共享的组件列表在第一次修改前复制，独占记录也随之换成本柜子自己的"""
+        if self._components_shared:
+            self._components = list(self._components)
+            self._components_shared = False
+            self._owned_components = set()
+    
+    def _insert_component(self, index: int, component: FurnitureComponent):
+        self._own_components()
+        self._components.insert(index, component)
+        self._owned_components.add(id(component))
+    
+    def _replace_components(self, index, value):
+        """替换或删除（value 为 None）组件，同时维护独占记录"""
+        self._own_components()
+        removed = self._components[index]
+        if isinstance(index, slice):
+            added = list(value)
+            self._components[index] = added
+        else:
+            removed = [removed]
+            added = [] if value is None else [value]
+            if value is None:
+                del self._components[index]
+            else:
+                self._components[index] = value
+        self._owned_components.difference_update(id(component) for component in removed)
+        self._owned_components.update(id(component) for component in added)
     
     def add_component(self, component: FurnitureComponent):
-        self.components.append(component)
+        self._insert_component(len(self._components), component)
+    
+    def component(self, index: int) -> FurnitureComponent:
+        """返回可修改的组件，与其他柜子共享的组件在第一次取用时才复制"""
+        child = self._components[index]
+        if id(child) not in self._owned_components:
+            self._own_components()
+            child = self._components[index] = child.clone()
+            self._owned_components.add(id(child))
+        return child
     
     def clone(self):
-        return deepcopy(self)
+        return self._cow_clone()
     
     def __str__(self):
         base_info = super().__str__()
         components_info = "\n  组件:"
-        for comp in self.components:
+        for comp in self._components:
             components_info += f"\n    - {comp}"
         return base_info + components_info
 
+def _children(component: Any) -> Sequence[Any]:
+    """只读地取出子组件，不触发写时复制，供序列化、驻留和比较使用"""
+    return getattr(component, "_components", ())
+
+class DimensionLayout:
+    """尺寸键布局：维度名按插入顺序驻留，维度序列相同的组件共享同一个布局"""
+    __slots__ = ("keys", "index", "_transitions")
+    
+    def __init__(self, keys: Tuple[str, ...] = ()):
+        self.keys = keys
+        self.index = {key: i for i, key in enumerate(keys)}
+        self._transitions: Dict[str, "DimensionLayout"] = {}
+    
+    def with_key(self, key: str) -> "DimensionLayout":
+        layout = self._transitions.get(key)
+        if layout is None:
+            layout = self._transitions[key] = DimensionLayout(self.keys + (sys.intern(key),))
+        return layout
+
+EMPTY_DIMENSION_LAYOUT = DimensionLayout()
+
+class SlottedFurnitureComponent(ABC):
+    """紧凑版家具组件：没有实例字典，尺寸值存放在按共享布局索引的元组中
+    
+    值元组不可变，克隆时直接共享，set_dimension 会生成新元组，因此天然是写时复制。
+    """
+    __slots__ = ("name", "material", "_layout", "_values")
+    
+    def __init__(self, name: str, material: str):
+        self.name = name
+        self.material = material
+        self._layout = EMPTY_DIMENSION_LAYOUT
+        self._values: Tuple[float, ...] = ()
+    
+    @abstractmethod
+    def clone(self):
+        pass
+    
+    @classmethod
+    def _from_parts(cls, name: str, material: str, dimensions: Dict[str, float],
+                    components: List[FurnitureComponent]):
+        obj = object.__new__(cls)
+        obj.name = name
+        obj.material = material
+        obj._layout = EMPTY_DIMENSION_LAYOUT
+        for key in dimensions:
+            obj._layout = obj._layout.with_key(key)
+        obj._values = tuple(dimensions.values())
+        return obj
+    
+    def _copy(self):
+        new = object.__new__(type(self))
+        new.name = self.name
+        new.material = self.material
+        new._layout = self._layout
+        new._values = self._values
+        return new
+    
+    def _dimension_items(self):
+        return zip(self._layout.keys, self._values)
+    
+    @property
+    def dimensions(self) -> Mapping[str, float]:
+        """尺寸的只读视图（副本），直接写入会抛出 TypeError，修改请用 set_dimension"""
+        return MappingProxyType(dict(zip(self._layout.keys, self._values)))
+    
+    def set_dimension(self, dimension: str, value: float):
+        i = self._layout.index.get(dimension)
+        if i is None:
+            self._layout = self._layout.with_key(dimension)
+            self._values += (value,)
+        else:
+            self._values = self._values[:i] + (value,) + self._values[i + 1:]
+    
+    def __str__(self):
+        dims = ", ".join([f"{k}: {v}cm" for k, v in zip(self._layout.keys, self._values)])
+        return f"{self.name} ({self.material}) - 尺寸: {dims}"
+
+class SlottedDrawer(SlottedFurnitureComponent):
+    __slots__ = ()
+    
+    def __init__(self, name: str, material: str):
+        super().__init__(name, material)
+        self.set_dimension("宽度", 40)
+        self.set_dimension("深度", 30)
+        self.set_dimension("高度", 15)
+    
+    def clone(self):
+        return self._copy()
+
+class SlottedDoor(SlottedFurnitureComponent):
+    __slots__ = ()
+    
+    def __init__(self, name: str, material: str):
+        super().__init__(name, material)
+        self.set_dimension("宽度", 60)
+        self.set_dimension("高度", 180)
+        self.set_dimension("厚度", 2)
+    
+    def clone(self):
+        return self._copy()
+
+# 模板存储中记录的组件类型
+TEMPLATE_TYPES = {cls.__name__: cls for cls in (Drawer, Door, Cabinet, SlottedDrawer, SlottedDoor)}
+
+class TemplateStore:
+    """只读的原型模板存储：由 FurnitureRegistry.save 写出，通过 mmap 映射后按需解码
+    
+    文件格式（小端）：
+        文件头  b"FURN" 版本号:H 原型数:I
+        索引    原型数 × [名称长度:H 名称 记录偏移:I 记录长度:I]
+        记录    [类型名长度:B 类型名 名称长度:H 名称 材料长度:H 材料
+                 尺寸数:H 尺寸数 × (键长度:H 键 类型:B 值) 子组件数:I 子组件记录...]
+    值按类型存放：0 为 q 整数，1 为 d 浮点数，2 为超出 64 位的整数（长度:H 十进制字符串）
+    
+    多个进程映射同一个文件时共享操作系统的页缓存，各进程无需各自持有原型对象。
+    """
+    MAGIC = b"FURN"
+    VERSION = 2  # 版本 2 增加了大整数类型，仍可读取版本 1 的文件
+    _HEADER = struct.Struct("<4sHI")
+    _U8 = struct.Struct("<B")
+    _U16 = struct.Struct("<H")
+    _U32 = struct.Struct("<I")
+    _INDEX_TAIL = struct.Struct("<II")
+    _INT = struct.Struct("<q")
+    _FLOAT = struct.Struct("<d")
+    _INT_RANGE = range(-2 ** 63, 2 ** 63)
+    
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = self._HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC or version not in (1, self.VERSION):
+            self.close()
+            raise ValueError(f"'{path}' 不是受支持的模板存储文件")
+        self._index: Dict[str, Tuple[int, int]] = {}
+        offset = self._HEADER.size
+        for _ in range(count):
+            name, offset = self._read_str(self._U16, offset)
+            record_offset, length = self._INDEX_TAIL.unpack_from(self._mm, offset)
+            offset += self._INDEX_TAIL.size
+            self._index[name] = (record_offset, length)
+    
+    @classmethod
+    def write(cls, path: str, prototypes: Dict[str, Any]):
+        """把原型序列化为模板存储文件，先写临时文件再替换"""
+        records = bytearray()
+        index = bytearray()
+        entries = []
+        for name, prototype in prototypes.items():
+            start = len(records)
+            cls._encode(prototype, records)
+            entries.append((name, start, len(records) - start))
+        header_size = cls._HEADER.size + sum(
+            cls._U16.size + len(name.encode("utf-8")) + cls._INDEX_TAIL.size for name, _, _ in entries)
+        for name, start, length in entries:
+            cls._write_str(index, cls._U16, name)
+            index += cls._INDEX_TAIL.pack(header_size + start, length)
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(cls._HEADER.pack(cls.MAGIC, cls.VERSION, len(entries)))
+                f.write(index)
+                f.write(records)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    @classmethod
+    def _write_str(cls, out: bytearray, length_struct: struct.Struct, text: str):
+        data = text.encode("utf-8")
+        out += length_struct.pack(len(data))
+        out += data
+    
+    @classmethod
+    def _encode(cls, component: Any, out: bytearray):
+        type_name = type(component).__name__
+        if type_name not in TEMPLATE_TYPES:
+            raise TypeError(f"不支持写入模板存储的组件类型: {type_name}")
+        cls._write_str(out, cls._U8, type_name)
+        cls._write_str(out, cls._U16, component.name)
+        cls._write_str(out, cls._U16, component.material)
+        dimensions = list(component._dimension_items())
+        out += cls._U16.pack(len(dimensions))
+        for key, value in dimensions:
+            cls._write_str(out, cls._U16, key)
+            # 保留整数与浮点的区别，__str__ 的输出才能与原型一致
+            if isinstance(value, int):
+                if value in cls._INT_RANGE:
+                    out += cls._U8.pack(0) + cls._INT.pack(value)
+                else:
+                    out += cls._U8.pack(2)
+                    cls._write_str(out, cls._U16, str(value))
+            else:
+                out += cls._U8.pack(1) + cls._FLOAT.pack(value)
+        children = _children(component)
+        out += cls._U32.pack(len(children))
+        for child in children:
+            cls._encode(child, out)
+    
+    def _read_str(self, length_struct: struct.Struct, offset: int) -> Tuple[str, int]:
+        (length,) = length_struct.unpack_from(self._mm, offset)
+        offset += length_struct.size
+        return self._mm[offset:offset + length].decode("utf-8"), offset + length
+    
+    def _decode(self, offset: int) -> Tuple[Any, int]:
+        type_name, offset = self._read_str(self._U8, offset)
+        name, offset = self._read_str(self._U16, offset)
+        material, offset = self._read_str(self._U16, offset)
+        (dimension_count,) = self._U16.unpack_from(self._mm, offset)
+        offset += self._U16.size
+        dimensions = {}
+        for _ in range(dimension_count):
+            key, offset = self._read_str(self._U16, offset)
+            (tag,) = self._U8.unpack_from(self._mm, offset)
+            offset += self._U8.size
+            if tag == 2:
+                text, offset = self._read_str(self._U16, offset)
+                dimensions[key] = int(text)
+                continue
+            value_struct = self._INT if tag == 0 else self._FLOAT
+            (dimensions[key],) = value_struct.unpack_from(self._mm, offset)
+            offset += value_struct.size
+        (child_count,) = self._U32.unpack_from(self._mm, offset)
+        offset += self._U32.size
+        children = []
+        for _ in range(child_count):
+            child, offset = self._decode(offset)
+            children.append(child)
+        return TEMPLATE_TYPES[type_name]._from_parts(name, material, dimensions, children), offset
+    
+    def names(self) -> List[str]:
+        return list(self._index)
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+    
+    def clone(self, name: str):
+        """直接从映射的页面解码出一个新的组件实例"""
+        if name not in self._index:
+            raise ValueError(f"原型 '{name}' 未注册")
+        component, _ = self._decode(self._index[name][0])
+        return component
+    
+    def close(self):
+        self._mm.close()
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def _mutable_type(component: Any) -> type:
+    """组件对应的普通（可修改）类型，驻留节点返回其原始类型"""
+    return getattr(type(component), "_mutable_type", type(component))
+
+def _reject_mutation(self, *args):
+    raise TypeError(f"驻留的组件 '{self.name}' 是只读的，需要修改时先 clone()")
+
+def _clone_interned(self):
+    """从驻留节点克隆出原始类型的写时复制副本"""
+    new = object.__new__(self._mutable_type)
+    if hasattr(self, "__dict__"):
+        # 可变部分在驻留时都已标记为共享，复制实例字典即可
+        new.__dict__.update(self.__dict__)
+    else:
+        for name in SlottedFurnitureComponent.__slots__:
+            setattr(new, name, getattr(self, name))
+    return new
+
+_INTERNED_TYPES: Dict[type, type] = {}
+
+def _interned_type(cls: type) -> type:
+    """为组件类型生成同名的只读子类：拒绝一切修改，clone() 返回原始类型的副本"""
+    interned = _INTERNED_TYPES.get(cls)
+    if interned is None:
+        namespace = {
+            "__slots__": (),
+            "__qualname__": cls.__qualname__,
+            "_mutable_type": cls,
+            "__setattr__": _reject_mutation,
+            "__delattr__": _reject_mutation,
+            "_share": lambda self: None,
+            "clone": _clone_interned,
+            "dimensions": property(lambda self: MappingProxyType(dict(self._dimension_items()))),
+        }
+        if issubclass(cls, Cabinet):
+            # 子组件本身也是驻留节点，返回元组即可保证整棵树只读
+            namespace["components"] = property(lambda self: tuple(self._components))
+        interned = _INTERNED_TYPES[cls] = type(cls.__name__, (cls,), namespace)
+    return interned
+
+class ComponentInterner:
+    """组件树驻留表：按内容对子树做结构哈希，内容相同的子树只保留一份
+    
+    驻留后的节点在多个柜子之间共享，是只读的：修改属性或尺寸会抛出 TypeError，
+    需要修改时先 clone() 得到普通的写时复制副本。
+    同一个驻留表产生的两棵树内容相同当且仅当它们是同一个对象，相等比较只需 `is`。
+    """
+    
+    def __init__(self):
+        self._pool: Dict[tuple, Any] = {}
+        self.nodes_seen = 0
+        self.bytes_saved = 0
+    
+    @staticmethod
+    def _footprint(component: Any) -> int:
+        """单个节点自身占用的字节数（不含子组件）"""
+        size = sys.getsizeof(component)
+        if hasattr(component, "__dict__"):
+            size += sys.getsizeof(component.__dict__)
+            size += sys.getsizeof(component._dimensions)
+            if isinstance(component, Cabinet):
+                size += sys.getsizeof(component._components)
+        else:
+            size += sys.getsizeof(component._values)
+        return size
+    
+    def intern(self, component: Any) -> Any:
+        """返回与 component 内容相同的驻留实例"""
+        children = [self.intern(child) for child in _children(component)]
+        dimensions = dict(component._dimension_items())
+        # 子组件已经驻留，用 id 即可代表其内容；值的类型参与哈希以区分 40 和 40.0
+        cls = _mutable_type(component)
+        key = (cls, component.name, component.material,
+               tuple((k, type(v), v) for k, v in dimensions.items()),
+               tuple(id(child) for child in children))
+        self.nodes_seen += 1
+        canonical = self._pool.get(key)
+        if canonical is not None:
+            self.bytes_saved += self._footprint(component)
+            return canonical
+        canonical = cls._from_parts(component.name, component.material, dimensions, children)
+        if hasattr(canonical, "_share"):
+            # 从驻留节点克隆出的副本与其共享可变部分，首次修改时才复制
+            canonical._share()
+        object.__setattr__(canonical, "__class__", _interned_type(cls))
+        self._pool[key] = canonical
+        return canonical
+    
+    def intern_all(self, components: Sequence[Any]) -> List[Any]:
+        return [self.intern(component) for component in components]
+    
+    def report(self) -> Dict[str, int]:
+        return {
+            "nodes_seen": self.nodes_seen,
+            "unique_nodes": len(self._pool),
+            "bytes_saved": self.bytes_saved,
+        }
+
+def content_equal(a: Any, b: Any) -> bool:
+    """逐层比较两棵组件树的内容，作为驻留前的相等比较基准"""
+    if _mutable_type(a) is not _mutable_type(b) or a.name != b.name or a.material != b.material:
+        return False
+    if list(a._dimension_items()) != list(b._dimension_items()):
+        return False
+    children_a = _children(a)
+    children_b = _children(b)
+    return len(children_a) == len(children_b) and all(
+        content_equal(x, y) for x, y in zip(children_a, children_b))
+
 class FurnitureRegistry:
     def __init__(self):
         self._prototypes: Dict[str, FurnitureComponent] = {}
@@ -71,6 +603,147 @@ class FurnitureRegistry:
         if name not in self._prototypes:
             raise ValueError(f"原型 '{name}' 未注册")
         return self._prototypes[name].clone()
+    
+    def save(self, path: str):
+        """把所有原型写入模板存储文件，供其他进程用 TemplateStore 映射"""
+        TemplateStore.write(path, self._prototypes)
+    
+    def clone_many(self, name: str, n: int,
+                   overrides: Union[None, Sequence[Dict[str, Any]], Dict[str, Sequence[Any]]] = None
+                   ) -> List[FurnitureComponent]:
+        """批量克隆 n 个实例：模板只准备一次，每个实例只复制对象外壳
+        
+        overrides 可以按实例给出（长度为 n 的字典列表），也可以按列给出
+        （{属性名: 长度为 n 的序列}）。"dimensions" 的值是要合并的尺寸字典，其他键必须是原型已有的属性。
+        """
+        if name not in self._prototypes:
+            raise ValueError(f"原型 '{name}' 未注册")
+        prototype = self._prototypes[name]
+        if overrides is not None and not isinstance(overrides, dict) and len(overrides) != n:
+            raise ValueError(f"overrides 长度 {len(overrides)} 与克隆数量 {n} 不一致")
+        if overrides is not None:
+            keys = overrides.keys() if isinstance(overrides, dict) else set().union(*overrides)
+            self._check_override_keys(prototype, keys)
+        
+        # 批量分配大量对象时暂停分代 GC，避免反复扫描刚创建的对象
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            if hasattr(prototype, "__dict__"):
+                prototype._share()
+                cls = _mutable_type(prototype)
+                template = dict(prototype.__dict__)
+                new = object.__new__
+                clones = []
+                append = clones.append
+                for _ in range(n):
+                    obj = new(cls)
+                    obj.__dict__ = template.copy()
+                    append(obj)
+            else:
+                # __slots__ 组件没有实例字典，逐个走本身已经很轻量的 clone()
+                clones = [prototype.clone() for _ in range(n)]
+            if overrides is not None:
+                self._apply_overrides(clones, overrides)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return clones
+    
+    def _apply_overrides(self, clones: List[FurnitureComponent],
+                         overrides: Union[Sequence[Dict[str, Any]], Dict[str, Sequence[Any]]]):
+        n = len(clones)
+        if isinstance(overrides, dict):
+            for key, column in overrides.items():
+                if len(column) != n:
+                    raise ValueError(f"overrides['{key}'] 长度 {len(column)} 与克隆数量 {n} 不一致")
+                if key == "dimensions":
+                    for obj, value in zip(clones, column):
+                        self._apply_override(obj, key, value)
+                else:
+                    for obj, value in zip(clones, column):
+                        setattr(obj, key, value)
+        else:
+            for obj, row in zip(clones, overrides):
+                for key, value in row.items():
+                    self._apply_override(obj, key, value)
+    
+    @staticmethod
+    def _check_override_keys(prototype: FurnitureComponent, keys):
+        """拒绝原型上不存在的属性名，避免拼错的键悄悄给克隆加上新属性"""
+        for key in keys:
+            if key == "dimensions":
+                continue
+            if key.startswith("_") or not hasattr(prototype, key) or callable(getattr(prototype, key)):
+                raise ValueError(f"原型 {type(prototype).__name__} 没有可覆盖的属性 '{key}'")
+    
+    @staticmethod
+    def _apply_override(obj: FurnitureComponent, key: str, value: Any):
+        if key == "dimensions":
+            for dimension, dimension_value in value.items():
+                obj.set_dimension(dimension, dimension_value)
+        else:
+            setattr(obj, key, value)
+
+def build_catalogue(size: int) -> FurnitureRegistry:
+    """构建一个包含 size 个柜子原型的目录，模拟工作进程启动时的注册过程"""
+    materials = ["实木", "红木", "橡木", "胡桃木"]
+    registry = FurnitureRegistry()
+    for i in range(size):
+        cabinet = Cabinet(f"柜子{i}", materials[i % len(materials)])
+        cabinet.set_dimension("宽度", 80 + i % 60)
+        for j in range(i % 3 + 1):
+            cabinet.add_component(Drawer(f"抽屉{j}", materials[j % len(materials)]))
+        cabinet.add_component(Door("柜门", materials[i % len(materials)]))
+        registry.register(f"cabinet_{i}", cabinet)
+    return registry
+
+def _private_memory_kb() -> Optional[int]:
+    """当前进程的私有常驻内存（RssAnon），非 Linux 平台返回 None"""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def _startup_worker(mode: str, catalogue_size: int, store_path: str, clones: int, results):
+    baseline = _private_memory_kb()
+    start = time.perf_counter()
+    if mode == "build":
+        source = build_catalogue(catalogue_size)
+    else:
+        source = TemplateStore(store_path)
+    startup = time.perf_counter() - start
+    items = [source.clone(f"cabinet_{i % catalogue_size}") for i in range(clones)]
+    memory = _private_memory_kb()
+    growth = memory - baseline if memory is not None and baseline is not None else None
+    results.put((startup, growth, len(items)))
+
+def benchmark_worker_startup(process_counts=(1, 8, 32), catalogue_size=5000, clones=1000):
+    """对比工作进程各自注册原型与映射共享模板存储的启动耗时与私有内存增长"""
+    with tempfile.TemporaryDirectory() as directory:
+        store_path = os.path.join(directory, "catalogue.furn")
+        build_catalogue(catalogue_size).save(store_path)
+        print(f"\n工作进程启动 ({catalogue_size} 个柜子原型, 模板文件 {os.path.getsize(store_path) / 1024:.0f} KB):")
+        ctx = multiprocessing.get_context("spawn")
+        for count in process_counts:
+            for label, mode in (("各自注册", "build"), ("映射模板", "mmap")):
+                results = ctx.Queue()
+                workers = [ctx.Process(target=_startup_worker,
+                                       args=(mode, catalogue_size, store_path, clones, results))
+                           for _ in range(count)]
+                for w in workers:
+                    w.start()
+                reports = [results.get() for _ in workers]
+                for w in workers:
+                    w.join()
+                startup = sum(r[0] for r in reports) / count
+                growths = [r[1] for r in reports if r[1] is not None]
+                memory = f"{sum(growths) / 1024:.1f} MB" if growths else "不可用"
+                print(f"  {count:>2} 进程 | {label}: 平均启动 {startup * 1000:7.1f} ms, 私有内存增长合计 {memory}")
 
 # 使用示例
 if __name__ == "__main__":
@@ -105,3 +778,115 @@ if __name__ == "__main__":
     print(registry.clone("cabinet"))
     print("\n定制柜子:")
     print(custom_cabinet)
+    
+    # 以下性能对比耗时较长，需加 --benchmark 运行
+    if "--benchmark" in sys.argv[1:]:
+        # 克隆性能对比
+        n = 20000
+        start = time.perf_counter()
+        slow = [deepcopy(cabinet_prototype) for _ in range(n)]
+        deepcopy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        fast = [registry.clone("cabinet") for _ in range(n)]
+        clone_time = time.perf_counter() - start
+        print(f"\n柜子克隆 {n} 次: deepcopy {deepcopy_time * 1000:.1f} ms, "
+              f"专用克隆 {clone_time * 1000:.1f} ms, 加速 {deepcopy_time / clone_time:.1f} 倍")
+        print(f"结果一致: {str(slow[-1]) == str(fast[-1])}")
+        
+        # 写时复制：未修改的部分与原型共享
+        large_cabinet = Cabinet("大衣柜", "实木")
+        for i in range(1000):
+            large_cabinet.add_component(registry.clone("drawer"))
+        for label, make_clone in (("deepcopy", lambda: deepcopy(large_cabinet)),
+                                  ("写时复制", large_cabinet.clone)):
+            start = time.perf_counter()
+            clones = [make_clone() for _ in range(100)]
+            elapsed = time.perf_counter() - start
+            del clones
+            # 单独统计内存，避免 tracemalloc 的开销影响计时
+            tracemalloc.start()
+            clones = [make_clone() for _ in range(100)]
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del clones
+            print(f"1000 组件柜子克隆 100 次 | {label}: {elapsed * 1000:.1f} ms, 内存峰值 {peak / 1024:.0f} KB")
+        
+        cow_cabinet = large_cabinet.clone()
+        cow_cabinet.component(0).set_dimension("宽度", 45)
+        print(f"修改克隆的第一个抽屉后, 原型宽度: {large_cabinet.components[0].dimensions['宽度']}cm, "
+              f"克隆宽度: {cow_cabinet.components[0].dimensions['宽度']}cm, "
+              f"其余组件仍共享: {_children(cow_cabinet)[1] is _children(large_cabinet)[1]}")
+        
+        # 批量克隆
+        n = 100000
+        materials = ["实木", "红木", "橡木", "胡桃木"] * (n // 4)
+        start = time.perf_counter()
+        single = []
+        for material in materials:
+            drawer = registry.clone("drawer")
+            drawer.material = material
+            single.append(drawer)
+        single_time = time.perf_counter() - start
+        start = time.perf_counter()
+        batch = registry.clone_many("drawer", n, overrides={"material": materials})
+        batch_time = time.perf_counter() - start
+        print(f"\n逐个克隆 {n} 个抽屉: {single_time * 1000:.1f} ms, "
+              f"clone_many: {batch_time * 1000:.1f} ms, 加速 {single_time / batch_time:.1f} 倍")
+        print(f"结果一致: {[str(d) for d in single] == [str(d) for d in batch]}")
+        
+        custom = registry.clone_many("cabinet", 2, overrides=[
+            {"material": "红木"},
+            {"dimensions": {"宽度": 90}},
+        ])
+        print(f"按实例覆盖: {custom[0].material} / {custom[1].dimensions}, "
+              f"原型尺寸不变: {cabinet_prototype.dimensions}")
+        
+        # 紧凑版组件的内存对比：每个抽屉都有自己的宽度
+        registry.register("slotted_drawer", SlottedDrawer("标准抽屉", "实木"))
+        print(f"\n紧凑版输出一致: {str(registry.clone('slotted_drawer')) == str(drawer_prototype)}")
+        n = 1000000
+        widths = [{"宽度": 30 + i % 40} for i in range(n)]
+        for label, name in (("普通", "drawer"), ("__slots__", "slotted_drawer")):
+            tracemalloc.start()
+            drawers = registry.clone_many(name, n, overrides={"dimensions": widths})
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del drawers
+            print(f"{n} 个{label}抽屉: {current / 1024 / 1024:.1f} MB, 每个 {current / n:.0f} 字节")
+        
+        # 模板存储：写出后由其他进程映射使用
+        with tempfile.TemporaryDirectory() as directory:
+            store_path = os.path.join(directory, "registry.furn")
+            registry.save(store_path)
+            with TemplateStore(store_path) as store:
+                print(f"\n从模板存储克隆的柜子与注册表一致: {str(store.clone('cabinet')) == str(registry.clone('cabinet'))}")
+        benchmark_worker_startup()
+        
+        # 结构哈希去重：独立构建的柜子中大量抽屉和门内容完全相同
+        tracemalloc.start()
+        cabinets = list(build_catalogue(20000)._prototypes.values())
+        original_size, _ = tracemalloc.get_traced_memory()
+        interner = ComponentInterner()
+        interned = interner.intern_all(cabinets)
+        same_output = all(str(a) == str(b) for a, b in zip(cabinets, interned))
+        del cabinets
+        interned_size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report = interner.report()
+        print(f"\n结构去重: {report['nodes_seen']} 个节点 -> {report['unique_nodes']} 个唯一节点, "
+              f"节省 {report['bytes_saved'] / 1024 / 1024:.1f} MB, 输出一致: {same_output}")
+        print(f"内存占用: 去重前 {original_size / 1024 / 1024:.1f} MB, "
+              f"去重后（含驻留表） {interned_size / 1024 / 1024:.1f} MB")
+        
+        twins = [(registry.clone("cabinet"), deepcopy(registry.clone("cabinet"))) for _ in range(10000)]
+        start = time.perf_counter()
+        for a, b in twins:
+            content_equal(a, b)
+        deep_time = time.perf_counter() - start
+        interned_twins = [(interner.intern(a), interner.intern(b)) for a, b in twins]
+        start = time.perf_counter()
+        for a, b in interned_twins:
+            a is b
+        identity_time = time.perf_counter() - start
+        print(f"10000 次相等比较: 逐层比较 {deep_time * 1000:.1f} ms, 驻留后按身份比较 {identity_time * 1000:.2f} ms, "
+              f"结果一致: {all(a is b for a, b in interned_twins)}")
@@ -1,23 +1,172 @@
 # -*- coding: utf-8 -*-
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, TextIO, Tuple, Union
 from datetime import datetime
+from array import array
+from bisect import bisect_left
+import gc
+import hashlib
+import importlib
 import json
+import os
+import random
 import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# 行级倒排索引 - 三元组支持子串查询，词元支持前缀查询
+class ContentIndex:
+    GRAM = 3
+    
+    def __init__(self, lines: Iterable[str] = ()):
+        self.lowered: List[str] = []
+        self._grams: Dict[str, array] = {}
+        self._tokens: Dict[str, array] = {}
+        self._vocabulary: Optional[List[str]] = None  # 有序词表，前缀查询时按需重建
+        for line in lines:
+            self.add(line)
+    
+    def add(self, text: str):
+        """追加一行；行号按追加顺序递增，倒排列表天然有序"""
+        i = len(self.lowered)
+        lowered = text.lower()
+        self.lowered.append(lowered)
+        grams = self._grams
+        n = self.GRAM
+        for gram in {lowered[j:j + n] for j in range(len(lowered) - n + 1)}:
+            postings = grams.get(gram)
+            if postings is None:
+                postings = grams[gram] = array('I')
+            postings.append(i)
+        for token in set(TOKEN_PATTERN.findall(lowered)):
+            postings = self._tokens.get(token)
+            if postings is None:
+                postings = self._tokens[token] = array('I')
+                self._vocabulary = None
+            postings.append(i)
+    
+    def _candidates(self, keyword: str):
+        """返回可能包含 keyword 的行号序列，None 表示需要全部扫描"""
+        n = self.GRAM
+        if len(keyword) < n:
+            return None
+        best = None
+        for j in range(len(keyword) - n + 1):
+            postings = self._grams.get(keyword[j:j + n])
+            if postings is None:
+                return ()
+            if best is None or len(postings) < len(best):
+                best = postings
+        return best
+    
+    def find_all(self, keywords: List[str]) -> List[int]:
+        """同时包含所有关键词的行号"""
+        keywords = [keyword.lower() for keyword in keywords]
+        candidates = None
+        for keyword in keywords:
+            postings = self._candidates(keyword)
+            if postings is not None and (candidates is None or len(postings) < len(candidates)):
+                candidates = postings
+        if candidates is None:
+            candidates = range(len(self.lowered))
+        lowered = self.lowered
+        return [i for i in candidates if all(keyword in lowered[i] for keyword in keywords)]
+    
+    def find_any(self, keywords: List[str]) -> List[int]:
+        """至少包含一个关键词的行号"""
+        matched = set()
+        for keyword in keywords:
+            matched.update(self.find_all([keyword]))
+        return sorted(matched)
+    
+    def find_prefix(self, prefix: str) -> List[int]:
+        """含有以 prefix 开头的词的行号"""
+        prefix = prefix.lower()
+        matched = set()
+        vocabulary = self._vocabulary
+        if vocabulary is None:
+            vocabulary = self._vocabulary = sorted(self._tokens)
+        for k in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            token = vocabulary[k]
+            if not token.startswith(prefix):
+                break
+            matched.update(self._tokens[token])
+        return sorted(matched)
+
+EXPORT_CHUNK_SIZE = 1 << 16  # export_to 攒够这么多字符再写一次文件
+
+def _iter_joined(separator: str, items: Iterable[str]) -> Iterator[str]:
+    """逐块生成 separator.join(items) 的内容，不拼出完整字符串"""
+    first = True
+    for item in items:
+        if not first:
+            yield separator
+        first = False
+        yield item
+
+# 文档内容行 - 直接修改时通知所属文档，缓存的统计和索引随之失效
+class ContentLines(list):
+    __slots__ = ("_owner",)
+    
+    def __init__(self, owner: "Document", lines: Iterable[str] = ()):
+        super().__init__(lines)
+        self._owner = owner
+    
+    def __reduce__(self):
+        # 默认的 list 子类反序列化会在设置 _owner 之前逐行 append
+        return ContentLines, (self._owner, list(self))
+
+def _invalidating(name: str):
+    method = getattr(list, name)
+    
+    def wrapper(self, *args, **kwargs):
+        self._owner._content_dirty = True
+        return method(self, *args, **kwargs)
+    wrapper.__name__ = name
+    return wrapper
+
+for _name in ("__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend",
+              "insert", "pop", "remove", "clear", "sort", "reverse"):
+    setattr(ContentLines, _name, _invalidating(_name))
+del _name
 
 # 抽象产品类 - 文档
 class Document(ABC):
     def __init__(self, title: str = "未命名文档"):
         self.title = title
-        self.content: List[str] = []
+        self._content = ContentLines(self)
+        now = datetime.now()
         self.metadata: Dict = {
-            "created_at": datetime.now(),
-            "modified_at": datetime.now(),
+            "created_at": now,
+            "modified_at": now,
             "version": 1.0,
             "author": "系统",
             "tags": [],
-            "word_count": 0
+            "word_count": 0,
+            "line_count": 0,
+            "char_count": 0
         }
+        self._batch_depth = 0
+        self._batch_dirty = False
+        self._indexed = False
+        self._index: Optional[ContentIndex] = None
+        self._content_dirty = False
+    
+    @property
+    def content(self) -> List[str]:
+        """内容行列表，可以直接修改，统计和索引会在下次使用前重算"""
+        return self._content
+    
+    @content.setter
+    def content(self, lines: Iterable[str]):
+        self._content = ContentLines(self, lines)
+        self._content_dirty = True
     
     @abstractmethod
     def add_content(self, text: str) -> str:
@@ -32,12 +181,76 @@ class Document(ABC):
         pass
     
     def update_metadata(self):
-        """更新文档元数据"""
+        """更新文档元数据
+        
+        字数、行数等统计在增删行时已经增量维护，这里只刷新修改时间和版本；
+        批量编辑期间推迟到 batch() 退出时统一刷新。
+        """
+        self._sync_content()
+        if self._batch_depth:
+            self._batch_dirty = True
+            return
         self.metadata["modified_at"] = datetime.now()
         self.metadata["version"] += 0.1
-        # 计算字数
-        total_words = sum(len(line.split()) for line in self.content)
-        self.metadata["word_count"] = total_words
+    
+    def _sync_content(self):
+        """内容被绕过 _append_line/remove_line 直接修改过时，回退到完整重算并丢弃索引"""
+        if self._content_dirty:
+            self._content_dirty = False
+            self._recount()
+            self._index = None
+    
+    def _recount(self):
+        self.metadata["word_count"] = sum(len(line.split()) for line in self.content)
+        self.metadata["line_count"] = len(self.content)
+        self.metadata["char_count"] = sum(len(line) for line in self.content)
+    
+    def _append_line(self, text: str):
+        """追加一行并增量更新统计"""
+        list.append(self._content, text)
+        metadata = self.metadata
+        metadata["word_count"] += len(text.split())
+        metadata["line_count"] += 1
+        metadata["char_count"] += len(text)
+        if self._index is not None:
+            self._index.add(text)
+        self.update_metadata()
+    
+    def _line_removed(self, index: int, text: str):
+        """删除一行时的钩子，此时该行仍在 content[index]
+        
+        子类在这里同步各自的派生状态，需要先完成所有可能失败的校验再修改状态；
+        钩子抛出异常时这一行不会被删除。
+        """
+        pass
+    
+    def remove_line(self, index: int) -> str:
+        """删除指定行（从 0 开始）并增量更新统计"""
+        content = self._content
+        index = range(len(content))[index]
+        text = content[index]
+        self._line_removed(index, text)
+        list.pop(content, index)
+        metadata = self.metadata
+        metadata["word_count"] -= len(text.split())
+        metadata["line_count"] -= 1
+        metadata["char_count"] -= len(text)
+        # 删除会改变后续行号，索引在下次查询时重建
+        self._index = None
+        self.update_metadata()
+        return f"删除内容: {text}"
+    
+    @contextmanager
+    def batch(self):
+        """批量编辑：期间的修改只在退出时刷新一次修改时间和版本"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batch_dirty:
+                self._batch_dirty = False
+                self.update_metadata()
     
     def add_tag(self, tag: str) -> str:
         """添加标签"""
@@ -47,14 +260,80 @@ class Document(ABC):
             return f"添加标签: {tag}"
         return f"标签 '{tag}' 已存在"
     
+    def enable_index(self) -> str:
+        """为文档建立倒排索引，之后的搜索走索引，add_content 会增量更新索引"""
+        self._indexed = True
+        self._get_index()
+        return f"已为 {self.metadata['line_count']} 行内容建立索引"
+    
+    def _get_index(self) -> Optional[ContentIndex]:
+        self._sync_content()
+        if self._indexed and self._index is None:
+            self._index = ContentIndex(self.content)
+        return self._index
+    
+    def _format_results(self, line_numbers: Iterable[int]) -> List[str]:
+        return [f"第{i+1}行: {self.content[i]}" for i in line_numbers]
+    
     def search_content(self, keyword: str) -> List[str]:
         """搜索内容"""
+        index = self._get_index()
+        if index is not None:
+            return self._format_results(index.find_all([keyword]))
         results = []
         for i, line in enumerate(self.content):
             if keyword.lower() in line.lower():
                 results.append(f"第{i+1}行: {line}")
         return results
     
+    def search_keywords(self, keywords: List[str], mode: str = "and") -> List[str]:
+        """多关键词搜索，mode 为 "and"（全部包含）或 "or"（包含任意一个）"""
+        if mode not in ("and", "or"):
+            raise ValueError(f"不支持的搜索模式: {mode}")
+        index = self._get_index()
+        if index is not None:
+            found = index.find_all(keywords) if mode == "and" else index.find_any(keywords)
+            return self._format_results(found)
+        lowered = [keyword.lower() for keyword in keywords]
+        match = all if mode == "and" else any
+        return self._format_results(
+            i for i, line in enumerate(self.content)
+            if match(keyword in line.lower() for keyword in lowered))
+    
+    def search_prefix(self, prefix: str) -> List[str]:
+        """搜索含有以 prefix 开头的词的行"""
+        index = self._get_index()
+        if index is not None:
+            return self._format_results(index.find_prefix(prefix))
+        prefix = prefix.lower()
+        return self._format_results(
+            i for i, line in enumerate(self.content)
+            if any(token.startswith(prefix) for token in TOKEN_PATTERN.findall(line.lower())))
+    
+    def iter_export(self) -> Iterator[str]:
+        """逐块生成导出内容，拼接结果与 export_content() 完全相同"""
+        yield self.export_content()
+    
+    def export_to(self, fileobj: TextIO) -> int:
+        """把导出内容流式写入文本文件对象，返回写入的字符数
+        
+        小块先攒到 EXPORT_CHUNK_SIZE 再写，内存占用与文档大小无关。
+        """
+        buffer = []
+        size = written = 0
+        for chunk in self.iter_export():
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= EXPORT_CHUNK_SIZE:
+                fileobj.write("".join(buffer))
+                written += size
+                buffer.clear()
+                size = 0
+        if buffer:
+            fileobj.write("".join(buffer))
+            written += size
+        return written
+    
     def get_metadata(self) -> str:
         tags_str = ", ".join(self.metadata["tags"]) if self.metadata["tags"] else "无"
         return (f"文档标题: {self.title}\n"
@@ -72,8 +351,7 @@ class TextDocument(Document):
         self.metadata["type"] = "text"
     
     def add_content(self, text: str) -> str:
-        self.content.append(text)
-        self.update_metadata()
+        self._append_line(text)
         return f"添加文本内容: {text}"
     
     def format_content(self) -> str:
@@ -83,43 +361,119 @@ class TextDocument(Document):
         header = f"=== {self.title} ===\n"
         footer = f"\n--- 文档信息 ---\n字数: {self.metadata['word_count']}"
         return header + self.format_content() + footer
+    
+    def iter_export(self) -> Iterator[str]:
+        yield f"=== {self.title} ===\n"
+        yield from _iter_joined("\n", self.content)
+        yield f"\n--- 文档信息 ---\n字数: {self.metadata['word_count']}"
+
+# 目录树节点 - 每个节点缓存自己子树渲染出的目录片段
+class TocEntry:
+    __slots__ = ("level", "line", "parent", "children", "_fragment")
+    
+    def __init__(self, level: int, line: str, parent: Optional["TocEntry"] = None):
+        self.level = level
+        self.line = line  # 渲染后的目录行，根节点为空
+        self.parent = parent
+        self.children: List["TocEntry"] = []
+        self._fragment: Optional[str] = None
+    
+    def invalidate(self):
+        """清除自己和祖先的缓存片段；缓存总是自底向上填充，遇到已失效的祖先即可停止"""
+        node = self
+        while node is not None and node._fragment is not None:
+            node._fragment = None
+            node = node.parent
+    
+    def render(self) -> str:
+        if self._fragment is None:
+            parts = [self.line] if self.parent is not None else []
+            parts.extend(child.render() for child in self.children)
+            self._fragment = "\n".join(parts)
+        return self._fragment
 
 # 具体产品类 - Markdown文档
 class MarkdownDocument(Document):
     def __init__(self, title: str = "Markdown文档"):
         super().__init__(title)
         self.metadata["type"] = "markdown"
-        self.toc: List[str] = []  # 目录
+        self._toc_root = TocEntry(0, "")
+        self._toc_entries: List[TocEntry] = []  # 按文档顺序排列的标题节点
+    
+    @property
+    def toc(self) -> Tuple[str, ...]:
+        """只读的目录行，由 add_content/remove_line 根据标题自动维护"""
+        return tuple(entry.line for entry in self._toc_entries)
     
     def add_content(self, text: str) -> str:
-        self.content.append(text)
-        self.update_metadata()
+        self._append_line(text)
         self._update_toc(text)
         return f"添加Markdown内容: {text}"
     
     def _update_toc(self, text: str):
-        """更新目录"""
+        """更新目录：新标题挂到最近一个级别更高的标题下，只有这条路径上的缓存失效"""
         if text.startswith('#'):
             level = len(text) - len(text.lstrip('#'))
             title = text.lstrip('# ').strip()
             indent = "  " * (level - 1)
-            self.toc.append(f"{indent}- {title}")
+            parent = self._toc_entries[-1] if self._toc_entries else self._toc_root
+            while parent.level >= level:
+                parent = parent.parent
+            entry = TocEntry(level, f"{indent}- {title}", parent)
+            parent.children.append(entry)
+            parent.invalidate()
+            self._toc_entries.append(entry)
+    
+    def _line_removed(self, index: int, text: str):
+        if not text.startswith('#'):
+            return
+        # 被删除的标题是第几个标题
+        ordinal = sum(1 for line in self.content[:index] if line.startswith('#'))
+        entry = self._toc_entries.pop(ordinal)
+        parent = entry.parent
+        parent.invalidate()
+        position = parent.children.index(entry)
+        del parent.children[position]
+        # 子节点改挂到前一个标题所在路径上级别更高的节点；挂回原父节点时保持原来的位置
+        previous = self._toc_entries[ordinal - 1] if ordinal else self._toc_root
+        for child in entry.children:
+            adopter = previous
+            while adopter is not parent and adopter.level >= child.level:
+                adopter = adopter.parent
+            child.parent = adopter
+            if adopter is parent:
+                parent.children.insert(position, child)
+                position += 1
+            else:
+                adopter.children.append(child)
+                adopter.invalidate()
+    
+    def _render_toc(self) -> str:
+        return self._toc_root.render()
     
     def format_content(self) -> str:
         return "\n\n".join(self.content)
     
     def export_content(self) -> str:
         toc_section = ""
-        if self.toc:
-            toc_section = "## 目录\n" + "\n".join(self.toc) + "\n\n"
+        if self._toc_entries:
+            toc_section = "## 目录\n" + self._render_toc() + "\n\n"
         
         return f"# {self.title}\n\n{toc_section}{self.format_content()}"
     
+    def iter_export(self) -> Iterator[str]:
+        yield f"# {self.title}\n\n"
+        if self._toc_entries:
+            yield "## 目录\n"
+            yield self._render_toc()
+            yield "\n\n"
+        yield from _iter_joined("\n\n", self.content)
+    
     def get_toc(self) -> str:
         """获取目录"""
-        if not self.toc:
+        if not self._toc_entries:
             return "暂无目录"
-        return "目录:\n" + "\n".join(self.toc)
+        return "目录:\n" + self._render_toc()
 
 # 具体产品类 - HTML文档
 class HTMLDocument(Document):
@@ -129,8 +483,7 @@ class HTMLDocument(Document):
         self.css_styles: List[str] = []
     
     def add_content(self, text: str) -> str:
-        self.content.append(text)
-        self.update_metadata()
+        self._append_line(text)
         return f"添加HTML内容: {text}"
     
     def add_css_style(self, css: str) -> str:
@@ -150,13 +503,61 @@ class HTMLDocument(Document):
         return (f"<!DOCTYPE html>\n<html>\n<head>\n"
                 f"<title>{self.title}</title>\n{css_section}</head>\n"
                 f"<body>\n{self.format_content()}\n</body>\n</html>")
+    
+    def iter_export(self) -> Iterator[str]:
+        yield "<!DOCTYPE html>\n<html>\n<head>\n"
+        yield f"<title>{self.title}</title>\n"
+        if self.css_styles:
+            yield "<style>\n"
+            yield from _iter_joined("\n", self.css_styles)
+            yield "\n</style>\n"
+        yield "</head>\n<body>\n"
+        yield from self.content
+        yield "\n</body>\n</html>"
+
+# 未解码的 JSON 片段 - 原文照原样输出，第一次取值时才解码
+class RawJSON:
+    __slots__ = ("text", "_value", "_decoded")
+    
+    def __init__(self, text: str):
+        self.text = text
+        self._value = None
+        self._decoded = False
+    
+    def decode(self):
+        if not self._decoded:
+            self._value = json.loads(self.text)
+            self._decoded = True
+        return self._value
+    
+    def __repr__(self):
+        return f"RawJSON({self.text!r})"
 
 # 具体产品类 - JSON文档
 class JSONDocument(Document):
+    _KEY_DECODER = json.JSONDecoder()
+    
     def __init__(self, title: str = "JSON文档"):
         super().__init__(title)
         self.metadata["type"] = "json"
-        self.data: Dict = {}
+        self._data: Dict = {}
+        self._raw_pending = False  # _data 中可能还有未解码的 RawJSON
+    
+    @property
+    def data(self) -> Dict:
+        """键值数据；add_pairs 暂存的 JSON 原文在这里统一解码，调用方拿到的都是普通值"""
+        if self._raw_pending:
+            data = self._data
+            for key, value in data.items():
+                if isinstance(value, RawJSON):
+                    data[key] = value.decode()
+            self._raw_pending = False
+        return self._data
+    
+    @data.setter
+    def data(self, value: Dict):
+        self._data = value
+        self._raw_pending = True
     
     def add_content(self, text: str) -> str:
         """对于JSON文档，text应该是key:value格式"""
@@ -171,26 +572,116 @@ class JSONDocument(Document):
                 except json.JSONDecodeError:
                     # 如果不是有效的JSON，就作为字符串处理
                     pass
-                self.data[key] = value
-                self.content.append(f'"{key}": {json.dumps(value, ensure_ascii=False)}')
+                self._data[key] = value
+                # 键按 JSON 字符串编码，含引号或反斜杠的键在删除行时也能原样解析回来
+                self._append_line(f'{json.dumps(key, ensure_ascii=False)}: {json.dumps(value, ensure_ascii=False)}')
             else:
                 # 如果不是key:value格式，作为注释添加
-                self.content.append(f'// {text}')
-            
-            self.update_metadata()
+                self._append_line(f'// {text}')
             return f"添加JSON内容: {text}"
         except Exception as e:
             return f"添加内容失败: {str(e)}"
     
+    def add_pairs(self, pairs: Iterable[tuple], validate: bool = True) -> str:
+        """批量添加 (键, JSON 原文) 键值对
+        
+        原文不重新编码，format_content 直接输出原文。默认入库前逐个解码校验，
+        任意一项不是合法的 JSON 时整批都不写入，与 add_content 一样返回失败信息；
+        只有调用方能保证原文合法时才传 validate=False，此时 get_value 第一次读取时才解码。
+        """
+        data = self._data
+        content = self._content
+        index = self._index
+        count = words = chars = 0
+        # 与 create_many 一样，批量分配期间暂停分代 GC
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            staged = []
+            try:
+                for key, text in pairs:
+                    text = text.strip()
+                    raw = RawJSON(text)
+                    if validate:
+                        raw.decode()
+                    staged.append((key, raw, f'{json.dumps(key, ensure_ascii=False)}: {text}'))
+            except Exception as e:
+                return f"批量添加失败: {str(e)}"
+            # 整批校验通过后才开始写入
+            for key, raw, line in staged:
+                data[key] = raw
+                list.append(content, line)
+                if index is not None:
+                    index.add(line)
+                count += 1
+                words += len(line.split())
+                chars += len(line)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self._raw_pending = True
+        # 统计一次性累加，修改时间和版本只刷新一次
+        metadata = self.metadata
+        metadata["word_count"] += words
+        metadata["line_count"] += count
+        metadata["char_count"] += chars
+        self.update_metadata()
+        return f"批量添加 {count} 个键值对"
+    
+    def _line_removed(self, index: int, text: str):
+        if text.startswith('//'):
+            return
+        # 行首是 JSON 编码的键，raw_decode 解析到键的结尾为止
+        key, end = self._KEY_DECODER.raw_decode(text)
+        # 同一个键可能写过多次，以其余行中最后一次出现的值为准；先解码再修改，失败时不改动任何状态
+        prefix = text[:end] + ": "
+        content = self._content
+        for i in range(len(content) - 1, -1, -1):
+            line = content[i]
+            if i != index and line.startswith(prefix):
+                self._data[key] = json.loads(line[len(prefix):])
+                return
+        self._data.pop(key, None)
+    
+    def _has_raw(self) -> bool:
+        return self._raw_pending and any(isinstance(value, RawJSON) for value in self._data.values())
+    
+    def _iter_pairs(self) -> Iterator[str]:
+        """逐个键值对生成 indent=2 的 JSON 文本；RawJSON 原样输出，其余值的输出与 json.dumps 相同"""
+        if not self._data:
+            yield "{}"
+            return
+        separator = "{\n  "
+        for key, value in self._data.items():
+            if isinstance(value, RawJSON):
+                encoded = value.text
+            else:
+                encoded = json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+            yield f"{separator}{json.dumps(key, ensure_ascii=False)}: {encoded}"
+            separator = ",\n  "
+        yield "\n}"
+    
     def format_content(self) -> str:
-        return json.dumps(self.data, ensure_ascii=False, indent=2)
+        if self._has_raw():
+            return "".join(self._iter_pairs())
+        return json.dumps(self._data, ensure_ascii=False, indent=2)
     
     def export_content(self) -> str:
         return self.format_content()
     
+    def iter_export(self) -> Iterator[str]:
+        if self._has_raw():
+            yield from self._iter_pairs()
+            return
+        # iterencode 与 json.dumps 共用同一套编码逻辑，输出逐段生成
+        yield from json.JSONEncoder(ensure_ascii=False, indent=2).iterencode(self._data)
+    
     def get_value(self, key: str) -> Optional[any]:
         """获取指定键的值"""
-        return self.data.get(key)
+        value = self._data.get(key)
+        if isinstance(value, RawJSON):
+            return value.decode()
+        return value
 
 # 抽象创建者类
 class DocumentCreator(ABC):
@@ -256,7 +747,371 @@ class JSONDocumentCreator(DocumentCreator):
     def create_document(self, title: str = None) -> Document:
         return JSONDocument(title or "新建JSON文档")
 
-def main():
+# 格式注册表 - 格式名或扩展名到创建者的 O(1) 分发
+class DocumentRegistry:
+    def __init__(self):
+        self._keys: Dict[str, str] = {}  # 格式名/扩展名 -> 格式名
+        self._loaders: Dict[str, Union[str, Callable[[], DocumentCreator]]] = {}
+        self._creators: Dict[str, DocumentCreator] = {}
+    
+    def register(self, format_name: str, loader: Union[str, Callable[[], DocumentCreator]],
+                 extensions: tuple = ()):
+        """注册格式
+        
+        loader 可以是创建者类（或任意无参可调用对象），也可以是 "模块:类名" 字符串；
+        字符串形式在第一次使用该格式时才导入，注册本身不触发任何导入。
+        """
+        format_name = format_name.lower()
+        self._loaders[format_name] = loader
+        self._creators.pop(format_name, None)
+        self._keys[format_name] = format_name
+        for extension in extensions:
+            self._keys["." + extension.lower().lstrip(".")] = format_name
+    
+    def formats(self) -> List[str]:
+        return list(self._loaders)
+    
+    def _resolve(self, key: str) -> str:
+        format_name = self._keys.get(key)
+        if format_name is None:
+            lowered = key.lower()
+            # 依次尝试格式名、扩展名（可省略点号）和带扩展名的文件名
+            format_name = (self._keys.get(lowered)
+                           or self._keys.get("." + lowered.lstrip("."))
+                           or self._keys.get(os.path.splitext(lowered)[1]))
+            if format_name is None:
+                raise ValueError(f"不支持的文档格式: {key}")
+        return format_name
+    
+    def creator(self, key: str) -> DocumentCreator:
+        """按格式名、扩展名或文件名获取创建者，创建者在第一次使用时才实例化"""
+        format_name = self._resolve(key)
+        creator = self._creators.get(format_name)
+        if creator is None:
+            loader = self._loaders[format_name]
+            if isinstance(loader, str):
+                module_name, _, attr = loader.partition(":")
+                loader = getattr(importlib.import_module(module_name), attr)
+            creator = self._creators[format_name] = loader()
+        return creator
+    
+    def create(self, key: str, title: str = None) -> Document:
+        return self.creator(key).create_document(title)
+    
+    def create_many(self, key: str, titles: List[str]) -> List[Document]:
+        """批量创建文档：格式只分发一次，创建者不保留这些文档"""
+        create_document = self.creator(key).create_document
+        # 批量分配大量对象时暂停分代 GC，避免反复扫描刚创建的文档
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return [create_document(title) for title in titles]
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+# 默认注册表：内置格式直接登记创建者类，创建者在第一次使用时才实例化；
+# "模块:类名" 字符串只用于外部插件，避免注册时就导入插件模块
+document_registry = DocumentRegistry()
+document_registry.register("text", TextDocumentCreator, extensions=(".txt",))
+document_registry.register("markdown", MarkdownDocumentCreator, extensions=(".md", ".markdown"))
+document_registry.register("html", HTMLDocumentCreator, extensions=(".html", ".htm"))
+document_registry.register("json", JSONDocumentCreator, extensions=(".json",))
+
+EXPORT_EXTENSIONS = {"text": ".txt", "markdown": ".md", "html": ".html", "json": ".json"}
+
+def _export_chunk(tasks: List[tuple]) -> Dict[str, List[float]]:
+    """工作进程：把一块文档写到各自的文件，返回 格式 -> [文档数, 字符数, 耗时]"""
+    stats: Dict[str, List[float]] = {}
+    for path, document in tasks:
+        start = time.perf_counter()
+        with open(path, "w", encoding="utf-8") as f:
+            chars = document.export_to(f)
+        entry = stats.setdefault(document.metadata["type"], [0, 0, 0.0])
+        entry[0] += 1
+        entry[1] += chars
+        entry[2] += time.perf_counter() - start
+    return stats
+
+def export_all(creators: List[DocumentCreator], out_dir: str, workers: Optional[int] = None,
+               chunk_size: int = 500) -> Dict[str, Dict]:
+    """把所有创建者的文档并行导出到 out_dir，返回每种格式的文档数、字符数和吞吐量
+    
+    文件路径只由创建者和文档的序号决定（<格式>/<创建者序号>-<文档序号>.<扩展名>），
+    每个文件由一个工作进程独立写出，所以输出与 workers 数量无关；workers=1 时在当前进程执行。
+    """
+    tasks = []
+    for c, creator in enumerate(creators):
+        for d, document in enumerate(creator._documents):
+            format_name = document.metadata["type"]
+            directory = os.path.join(out_dir, format_name)
+            tasks.append((os.path.join(directory, f"{c:03d}-{d:07d}{EXPORT_EXTENSIONS[format_name]}"), document))
+    for format_name in {document.metadata["type"] for _, document in tasks}:
+        os.makedirs(os.path.join(out_dir, format_name), exist_ok=True)
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+    
+    start = time.perf_counter()
+    if workers == 1:
+        results = [_export_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_export_chunk, chunks))
+    elapsed = time.perf_counter() - start
+    
+    report: Dict[str, Dict] = {}
+    for stats in results:
+        for format_name, (count, chars, seconds) in stats.items():
+            entry = report.setdefault(format_name, {"documents": 0, "chars": 0, "seconds": 0.0})
+            entry["documents"] += count
+            entry["chars"] += chars
+            entry["seconds"] += seconds
+    for entry in report.values():
+        # seconds 是各工作进程写该格式的累计耗时，吞吐量按单个工作进程计
+        entry["docs_per_second"] = entry["documents"] / entry["seconds"] if entry["seconds"] else 0.0
+    report["total"] = {"documents": len(tasks), "seconds": elapsed,
+                       "docs_per_second": len(tasks) / elapsed if elapsed else 0.0}
+    return report
+
+def _tree_digest(root: str) -> str:
+    """按相对路径排序后对目录下所有文件内容求哈希，用于比较两次导出是否一致"""
+    digest = hashlib.sha256()
+    for directory, _, files in sorted(os.walk(root)):
+        for name in sorted(files):
+            path = os.path.join(directory, name)
+            digest.update(os.path.relpath(path, root).encode("utf-8"))
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+def benchmark_export_all(per_format: int = 20000, worker_counts=(1, 2, 4)):
+    """按工作进程数对比 export_all 的吞吐量，并校验输出与进程数无关"""
+    creators = [TextDocumentCreator(), MarkdownDocumentCreator(), HTMLDocumentCreator(), JSONDocumentCreator()]
+    for creator in creators:
+        for i in range(per_format):
+            document = creator.create_document(f"夜间导出{i}")
+            with document.batch():
+                for j in range(10):
+                    if isinstance(document, JSONDocument):
+                        document.add_content(f"key{j}: {i * j}")
+                    elif isinstance(document, MarkdownDocument) and j % 5 == 0:
+                        document.add_content(f"## 第{j // 5}节")
+                    else:
+                        document.add_content(f"文档{i} 第{j}行 nightly export line")
+            creator._documents.append(document)
+    
+    print(f"\n并行导出基准测试 ({len(creators) * per_format} 个文档, CPU 数 {os.cpu_count()}):")
+    digests = set()
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in worker_counts:
+            out_dir = os.path.join(tmp, f"workers-{workers}")
+            report = export_all(creators, out_dir, workers=workers)
+            digests.add(_tree_digest(out_dir))
+            total = report.pop("total")
+            per_format_rates = ", ".join(f"{name} {entry['docs_per_second']:,.0f}"
+                                         for name, entry in sorted(report.items()))
+            print(f"  {workers} 个进程: {total['seconds']:.2f} s, {total['docs_per_second']:,.0f} 文档/秒 "
+                  f"(单进程各格式 文档/秒: {per_format_rates})")
+    print(f"  不同进程数的输出一致: {len(digests) == 1}")
+
+def benchmark_create_many(n: int = 1000000):
+    """对比逐个分发创建与 create_many 批量创建 n 个文档"""
+    titles = [f"文档{i}" for i in range(n)]
+    start = time.perf_counter()
+    single = [document_registry.create("report.md", title) for title in titles]
+    single_time = time.perf_counter() - start
+    del single
+    start = time.perf_counter()
+    batch = document_registry.create_many("report.md", titles)
+    batch_time = time.perf_counter() - start
+    print(f"创建 {n} 个文档: 逐个分发 {single_time:.2f} s, create_many {batch_time:.2f} s, "
+          f"每秒 {n / batch_time:,.0f} 个")
+    del batch
+
+def benchmark_incremental_metadata(sizes=(250000, 500000, 1000000), legacy_sizes=(1000, 2000, 4000)):
+    """追加 n 行的耗时：增量统计随行数线性增长，旧的全量重算是平方级"""
+    print("\n追加行数与耗时:")
+    for n in legacy_sizes:
+        doc = TextDocument("旧实现")
+        start = time.perf_counter()
+        for i in range(n):
+            doc.content.append(f"第 {i} 行 一些 内容")
+            doc.metadata["word_count"] = sum(len(line.split()) for line in doc.content)
+        elapsed = time.perf_counter() - start
+        print(f"  全量重算 {n:>8} 行: {elapsed:7.3f} s, 每行 {elapsed / n * 1e6:8.2f} µs")
+    for n in sizes:
+        doc = TextDocument("增量统计")
+        start = time.perf_counter()
+        with doc.batch():
+            for i in range(n):
+                doc.add_content(f"第 {i} 行 一些 内容")
+        elapsed = time.perf_counter() - start
+        print(f"  增量统计 {n:>8} 行: {elapsed:7.3f} s, 每行 {elapsed / n * 1e6:8.2f} µs, "
+              f"字数 {doc.metadata['word_count']}, 版本 {doc.metadata['version']:.1f}")
+
+def benchmark_search(lines: int = 500000, queries: int = 10000, scan_samples: int = 6):
+    """在大文档上对比逐行扫描与倒排索引的查询耗时（子串、前缀、AND 三类选择性查询轮流出现）
+    
+    逐行扫描太慢，只抽样 scan_samples 次估算单次耗时。
+    """
+    rng = random.Random(42)
+    words = ["Python", "设计模式", "factory", "工厂方法", "document", "索引", "markdown",
+             "html", "性能", "benchmark", "creator", "registry", "内容", "search"]
+    doc = MarkdownDocument("大文档")
+    with doc.batch():
+        for i in range(lines):
+            doc.add_content(" ".join(rng.choice(words) for _ in range(6)) + f" item{i}")
+    
+    def make_queries(count):
+        picked = []
+        for i in range(count):
+            number = str(rng.randrange(lines))
+            kind = i % 3
+            if kind == 0:
+                picked.append(("子串", doc.search_content, (f"item{number}",)))
+            elif kind == 1:
+                picked.append(("前缀", doc.search_prefix, (f"item{number}",)))
+            else:
+                picked.append(("AND", doc.search_keywords, ([rng.choice(words), f"item{number}"],)))
+        return picked
+    
+    samples = make_queries(scan_samples)
+    workload = make_queries(queries)
+    
+    start = time.perf_counter()
+    expected = [search(*args) for _, search, args in samples]
+    scan_time = (time.perf_counter() - start) / len(samples)
+    
+    start = time.perf_counter()
+    doc.enable_index()
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _, search, args in workload:
+        search(*args)
+    index_time = (time.perf_counter() - start) / len(workload)
+    same = expected == [search(*args) for _, search, args in samples]
+    print(f"\n{lines} 行文档: 逐行扫描 {scan_time * 1000:.1f} ms/次（抽样 {len(samples)} 次）, "
+          f"建索引 {build_time:.2f} s, 索引查询 {index_time * 1e6:.1f} µs/次（{len(workload)} 次）, "
+          f"加速 {scan_time / index_time:.0f} 倍, 结果一致: {same}")
+
+def benchmark_json_pairs(n: int = 1000000):
+    """n 个键值对：对比逐个 add_content（解码再编码）与 add_pairs（保留原文、按需解码）"""
+    fragments = ['{"id": %d, "标签": ["设计模式", "工厂方法"], "启用": true}', '"值%d"', '%d', '[%d, 2, 3]']
+    pairs = [(f"key{i}", fragments[i % len(fragments)] % i) for i in range(n)]
+    
+    start = time.perf_counter()
+    eager = JSONDocument("逐个解码")
+    with eager.batch():
+        for key, text in pairs:
+            eager.add_content(f"{key}: {text}")
+    eager_add = time.perf_counter() - start
+    start = time.perf_counter()
+    eager_output = eager.format_content()
+    eager_format = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    checked = JSONDocument("校验原文")
+    checked.add_pairs(pairs)
+    checked_add = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    lazy = JSONDocument("按需解码")
+    lazy.add_pairs(pairs, validate=False)
+    lazy_add = time.perf_counter() - start
+    start = time.perf_counter()
+    lazy_output = lazy.format_content()
+    lazy_format = time.perf_counter() - start
+    
+    probes = [f"key{i}" for i in range(0, n, max(1, n // 1000))]
+    same = all(lazy.get_value(key) == eager.get_value(key) == checked.get_value(key) for key in probes) and \
+        json.loads(lazy_output) == json.loads(eager_output)
+    print(f"\n{n} 个键值对: add_content {eager_add:.2f} s + format {eager_format:.2f} s, "
+          f"add_pairs {checked_add:.2f} s, add_pairs(validate=False) {lazy_add:.2f} s + format {lazy_format:.2f} s, "
+          f"取值和解析结果一致: {same}")
+
+def benchmark_toc(headings: int = 100000, renders: int = 50):
+    """100k 个标题的文档：对比每次都从正文重建目录与增量目录树的渲染、删除耗时"""
+    def legacy_toc(content: List[str]) -> str:
+        toc = []
+        for text in content:
+            if text.startswith('#'):
+                level = len(text) - len(text.lstrip('#'))
+                toc.append(f"{'  ' * (level - 1)}- {text.lstrip('# ').strip()}")
+        return "\n".join(toc)
+    
+    doc = MarkdownDocument("长文档")
+    start = time.perf_counter()
+    with doc.batch():
+        for i in range(headings):
+            doc.add_content(f"{'#' * (1 + i % 3)} 标题{i}")
+            doc.add_content(f"第{i}节正文")
+    build_time = time.perf_counter() - start
+    
+    # 每渲染一次前都在末尾追加一个标题，模拟边写边预览
+    start = time.perf_counter()
+    for i in range(renders):
+        doc.add_content(f"### 追加{i}")
+        legacy_toc(doc.content)
+    legacy_time = (time.perf_counter() - start) / renders
+    start = time.perf_counter()
+    for i in range(renders):
+        doc.add_content(f"### 追加{i}")
+        rendered = doc._render_toc()
+    incremental_time = (time.perf_counter() - start) / renders
+    same = rendered == legacy_toc(doc.content)
+    
+    start = time.perf_counter()
+    for _ in range(renders):
+        doc.remove_line(len(doc.content) // 2 // 2 * 2)  # 删除中间的一个标题
+        doc._render_toc()
+    remove_time = (time.perf_counter() - start) / renders
+    same = same and doc._render_toc() == legacy_toc(doc.content)
+    print(f"\n{headings} 个标题: 建树 {build_time:.2f} s, 追加后渲染目录 重建 {legacy_time * 1000:.1f} ms/次 vs "
+          f"增量 {incremental_time * 1000:.2f} ms/次, 删除标题后渲染 {remove_time * 1000:.2f} ms/次, 结果一致: {same}")
+
+def benchmark_export(lines: int = 200000):
+    """对比 export_content() 整体写出与 export_to() 流式写出的峰值内存和吞吐量"""
+    docs = [TextDocument("大文本"), MarkdownDocument("大Markdown"), HTMLDocument("大HTML"), JSONDocument("大JSON")]
+    docs[2].add_css_style("body { font-family: sans-serif; }")
+    for doc in docs:
+        with doc.batch():
+            for i in range(lines):
+                if isinstance(doc, JSONDocument):
+                    doc.add_content(f'key{i}: {{"id": {i}, "标签": ["设计模式", "工厂方法"], "值": {i * 0.5}}}')
+                elif isinstance(doc, MarkdownDocument) and i % 100 == 0:
+                    doc.add_content(f"## 第{i // 100}节")
+                else:
+                    doc.add_content(f"第{i}行 工厂方法模式把实例化延迟到子类 factory method line {i}")
+    
+    def whole(doc, f):
+        f.write(doc.export_content())
+    
+    def streamed(doc, f):
+        doc.export_to(f)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"\n导出基准测试 ({lines} 行/文档):")
+        for doc in docs:
+            outputs = {}
+            for label, export in (("export_content", whole), ("export_to", streamed)):
+                path = os.path.join(tmp, f"{label}.out")
+                # 计时与内存分开测量，tracemalloc 会拖慢计时
+                start = time.perf_counter()
+                with open(path, "w", encoding="utf-8") as f:
+                    export(doc, f)
+                elapsed = time.perf_counter() - start
+                tracemalloc.start()
+                with open(path, "w", encoding="utf-8") as f:
+                    export(doc, f)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                with open(path, "rb") as f:
+                    outputs[label] = f.read()
+                size = len(outputs[label])
+                print(f"  {type(doc).__name__:<16} {label:<14}: {size / elapsed / 1e6:7.1f} MB/s, "
+                      f"峰值内存 {peak / 1e6:8.2f} MB")
+            print(f"  {type(doc).__name__:<16} 字节一致: {outputs['export_content'] == outputs['export_to']}")
+
+def main(benchmark=False):
     # 创建不同类型的文档创建者
     text_creator = TextDocumentCreator()
     markdown_creator = MarkdownDocumentCreator()
@@ -308,5 +1163,68 @@ def main():
     print("Markdown文档创建者:")
     print(markdown_creator.list_documents())
 
+    # 以下新功能的演示和基准测试耗时较长，需加 --benchmark 运行
+    if benchmark:
+        # 格式注册表
+        print("\n=== 格式注册表 ===")
+        for key in ("markdown", ".HTML", "notes.txt", "data.json"):
+            doc = document_registry.create(key, f"{key} 文档")
+            print(f"{key} -> {type(doc).__name__}")
+        benchmark_create_many()
+
+        # 增量元数据与批量编辑
+        print("\n=== 增量元数据 ===")
+        doc = TextDocument("批量编辑")
+        with doc.batch():
+            for line in ["第一行 内容", "第二行 更多 内容", "第三行"]:
+                doc.add_content(line)
+        print(doc.remove_line(1))
+        print(f"字数: {doc.metadata['word_count']}, 行数: {doc.metadata['line_count']}, "
+              f"版本: {doc.metadata['version']:.1f}")
+        print(md_doc.remove_line(1))
+        print(md_doc.get_toc())
+        benchmark_toc()
+        print(json_doc.remove_line(0))
+        print(f"获取name值: {json_doc.get_value('name')}")
+        benchmark_incremental_metadata()
+
+        # 批量添加 JSON 键值对
+        print("\n=== JSON 批量添加 ===")
+        bulk_doc = JSONDocument("批量数据")
+        print(bulk_doc.add_pairs([("id", "42"), ("tags", '["a", "b"]'), ("config", '{"debug": false}')]))
+        print(bulk_doc.format_content())
+        print(f"按需解码 config: {bulk_doc.get_value('config')}")
+        benchmark_json_pairs()
+
+        # 倒排索引搜索
+        print("\n=== 倒排索引搜索 ===")
+        print(md_doc.enable_index())
+        md_doc.add_content("## 子标题3 更多内容")
+        print(f"子串: {md_doc.search_content('标题')}")
+        print(f"前缀: {md_doc.search_prefix('子标')}")
+        print(f"AND: {md_doc.search_keywords(['子标题', '内容'])}")
+        print(f"OR: {md_doc.search_keywords(['列表项1', '主标题'], mode='or')}")
+        benchmark_search()
+
+        # 流式导出
+        print("\n=== 流式导出 ===")
+        for document in (doc, md_doc, html_doc, json_doc):
+            with tempfile.TemporaryFile("w+", encoding="utf-8") as f:
+                written = document.export_to(f)
+                f.seek(0)
+                print(f"{type(document).__name__}: 写入 {written} 字符, 与 export_content 一致: "
+                      f"{f.read() == document.export_content()}")
+        benchmark_export()
+
+        # 并行批量导出
+        print("\n=== 并行批量导出 ===")
+        with tempfile.TemporaryDirectory() as tmp:
+            creators = [text_creator, markdown_creator, html_creator, json_creator]
+            report = export_all(creators, tmp, workers=2)
+            for name, entry in sorted(report.items()):
+                print(f"{name}: {entry['documents']} 个文档")
+            print(sorted(os.listdir(os.path.join(tmp, "markdown"))))
+        benchmark_export_all()
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main(benchmark="--benchmark" in sys.argv[1:])
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Hashable, Optional, Set
 from dataclasses import dataclass
 from enum import Enum
+import sys
+import time
 
 class DeviceType(Enum):
     """设备类型枚举"""
@@ -45,6 +47,11 @@ class Processor(ABC):
         """停止处理器"""
         self.is_running = False
         self.temperature = max(35, self.temperature - 20)
+    
+    def reset(self) -> None:
+        """恢复出厂状态，供组件池复用"""
+        self.temperature = 35
+        self.is_running = False
 
 # 抽象产品：显示器
 class Display(ABC):
@@ -74,6 +81,11 @@ class Display(ABC):
     def turn_off(self) -> None:
         """关闭显示器"""
         self.is_on = False
+    
+    def reset(self) -> None:
+        """恢复出厂状态，供组件池复用"""
+        self.brightness = 50
+        self.is_on = False
 
 # 抽象产品：电池
 class Battery(ABC):
@@ -103,6 +115,11 @@ class Battery(ABC):
     def consume_power(self, amount: int) -> None:
         """消耗电力"""
         self.current_charge = max(0, self.current_charge - amount)
+    
+    def reset(self) -> None:
+        """恢复出厂状态（充满电），供组件池复用"""
+        self.current_charge = self.capacity
+        self.is_charging = False
 
 # 具体产品：高性能处理器
 class HighPerformanceProcessor(Processor):
@@ -271,6 +288,10 @@ class DeviceFactory(ABC):
     def get_device_type(self) -> DeviceType:
         """获取设备类型"""
         pass
+    
+    def create_device(self) -> "Device":
+        """创建一整套组件并组装成设备"""
+        return Device(self.create_processor(), self.create_display(), self.create_battery(), self.get_device_type())
 
 # 具体工厂：高端设备工厂
 class PremiumDeviceFactory(DeviceFactory):
@@ -341,6 +362,13 @@ class Device:
             "电池": self.battery.get_specifications()
         }
     
+    def reset(self) -> None:
+        """把三个组件恢复出厂状态，供组件池复用"""
+        self.processor.reset()
+        self.display.reset()
+        self.battery.reset()
+        self.is_powered_on = False
+    
     def power_off(self) -> str:
         """关机"""
         if self.is_powered_on:
@@ -350,6 +378,93 @@ class Device:
             return f"📴 {self.device_type.value}已关机"
         return f"⚠️ {self.device_type.value}已经处于关机状态"
 
+# 组件池
+class ComponentPool:
+    """有界组件池 - 按键分别保存已重置的空闲组件，统计命中、未命中和丢弃次数"""
+    
+    def __init__(self, max_size: int = 64):
+        self.max_size = max_size  # 每个键最多保留的空闲组件数
+        self._idle: Dict[Hashable, List[Any]] = {}
+        self._pooled: Set[int] = set()  # 池中空闲组件的 id，防止同一组件被重复放回
+        self.hits = 0
+        self.misses = 0
+        self.recycled = 0
+        self.dropped = 0
+    
+    def acquire(self, key: Hashable, create: Callable[[], Any]) -> Any:
+        """取出一个空闲组件，池中没有时调用 create 新建"""
+        idle = self._idle.get(key)
+        if idle:
+            self.hits += 1
+            component = idle.pop()
+            self._pooled.discard(id(component))
+            return component
+        self.misses += 1
+        return create()
+    
+    def release(self, key: Hashable, component: Any) -> None:
+        """重置组件后放回池中，池已满时直接丢弃；组件已在池中时抛出 ValueError"""
+        if id(component) in self._pooled:
+            raise ValueError("组件已在池中，不能重复回收")
+        idle = self._idle.get(key)
+        if idle is None:
+            idle = self._idle[key] = []
+        if len(idle) < self.max_size:
+            component.reset()
+            idle.append(component)
+            self._pooled.add(id(component))
+            self.recycled += 1
+        else:
+            self.dropped += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """组件池统计信息"""
+        requests = self.hits + self.misses
+        return {
+            "max_size": self.max_size,
+            "idle": sum(len(idle) for idle in self._idle.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "recycled": self.recycled,
+            "dropped": self.dropped,
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
+
+# 池化工厂：包装任意设备工厂，复用已关机设备的整套组件
+class PooledDeviceFactory(DeviceFactory):
+    """可选的池化设备工厂
+    
+    create_device 先从组件池取一台已回收的设备，取不到再用被包装的工厂新建；设备关机后
+    调用 recycle，处理器、显示器和电池重置后作为一套放回池中。整套复用只需一次池操作，
+    比逐个组件入池再取出更省。池按工厂类型分组，多个工厂可以共用一个池。
+    """
+    
+    def __init__(self, factory: DeviceFactory, pool: Optional[ComponentPool] = None):
+        self.factory = factory
+        self.pool = pool if pool is not None else ComponentPool()
+        self._key = type(factory)
+    
+    def create_processor(self) -> Processor:
+        return self.factory.create_processor()
+    
+    def create_display(self) -> Display:
+        return self.factory.create_display()
+    
+    def create_battery(self) -> Battery:
+        return self.factory.create_battery()
+    
+    def get_device_type(self) -> DeviceType:
+        return self.factory.get_device_type()
+    
+    def create_device(self) -> "Device":
+        return self.pool.acquire(self._key, self.factory.create_device)
+    
+    def recycle(self, device: "Device") -> None:
+        """回收已关机的设备；回收后不要再使用原来的设备引用"""
+        if device.is_powered_on:
+            raise ValueError(f"{device.device_type.value}仍在运行，请先关机再回收")
+        self.pool.release(self._key, device)
+
 # 客户端代码
 def create_and_test_device(factory: DeviceFactory) -> None:
     """创建并测试设备"""
@@ -394,6 +509,60 @@ def create_and_test_device(factory: DeviceFactory) -> None:
     # 关机
     print(f"\n  {device.power_off()}")
 
+def _run_cycle(device: "Device", rounds: int) -> List[str]:
+    """一次完整的使用周期：开机、运行若干轮、关机"""
+    output = [device.power_on()]
+    for _ in range(rounds):
+        output.extend(device.operate())
+    output.append(device.power_off())
+    return output
+
+def check_pooled_factory(cycles: int = 200) -> bool:
+    """池化工厂复用的组件经过重置，每个周期的输出与全新设备完全相同"""
+    for factory in (PremiumDeviceFactory(), StandardDeviceFactory()):
+        pooled = PooledDeviceFactory(factory, ComponentPool(max_size=2))
+        for i in range(cycles):
+            rounds = 1 + i % 5
+            fresh_output = _run_cycle(factory.create_device(), rounds)
+            device = pooled.create_device()
+            if _run_cycle(device, rounds) != fresh_output:
+                return False
+            pooled.recycle(device)
+        if pooled.pool.stats()["misses"] != 1:
+            return False
+    return True
+
+def benchmark_device_cycles(cycles: int = 500000, live: int = 8, repeat: int = 3):
+    """模拟循环中反复创建、开机、关机、销毁设备：每次新建组件 vs 池化复用
+    
+    同时在用的设备最多 live 台，池大小与之相同；每种方式取 repeat 次中最快的一次。
+    """
+    print(f"\n🏁 {cycles} 次设备创建/销毁周期（同时在用 {live} 台）：")
+    for factory in (PremiumDeviceFactory(), StandardDeviceFactory()):
+        pooled = PooledDeviceFactory(factory, ComponentPool(max_size=live))
+        timings = {}
+        for label, source, recycle in (("每次新建", factory, None), ("组件池", pooled, pooled.recycle)):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                in_use = []
+                for _ in range(cycles):
+                    device = source.create_device()
+                    device.power_on()
+                    in_use.append(device)
+                    if len(in_use) == live:
+                        for device in in_use:
+                            device.power_off()
+                            if recycle is not None:
+                                recycle(device)
+                        in_use.clear()
+                best = min(best, time.perf_counter() - start)
+            timings[label] = best
+        stats = pooled.pool.stats()
+        print(f"  {factory.get_device_type().value}: 每次新建 {timings['每次新建']:.2f} s，"
+              f"组件池 {timings['组件池']:.2f} s（命中 {stats['hits']}，未命中 {stats['misses']}，"
+              f"命中率 {stats['hit_rate']:.1%}，丢弃 {stats['dropped']}）")
+
 # 使用示例
 if __name__ == "__main__":
     print("📱 电子设备工厂抽象工厂模式演示")
@@ -412,3 +581,8 @@ if __name__ == "__main__":
     print("💡 注意：同一工厂创建的组件保持了性能等级的一致性。")
     print("🔋 提示：电池电量会随着使用而减少。")
     print(f"{'='*60}")
+    
+    # 以下性能对比耗时较长，需加 --benchmark 运行
+    if "--benchmark" in sys.argv[1:]:
+        print(f"\n♻️ 池化工厂复用组件的输出与全新设备一致：{check_pooled_factory()}")
+        benchmark_device_cycles()
@@ -1,8 +1,23 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
 from dataclasses import dataclass
 from enum import Enum
+import gc
 import json
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 是可选依赖，只有 Fleet 和 PerformanceTable 用到
+    np = None
 
 # 引擎类型枚举
 class EngineType(Enum):
@@ -23,7 +38,7 @@ class EmissionLevel(Enum):
     HIGH = "高排放"
     ZERO = "零排放"
 
-@dataclass
+@dataclass(frozen=True)
 class CarSpecification:
     """汽车规格数据类"""
     name: str
@@ -31,7 +46,7 @@ class CarSpecification:
     unit: str = ""
     description: str = ""
 
-@dataclass
+@dataclass(frozen=True)
 class PerformanceMetrics:
     """性能指标数据类"""
     acceleration: float  # 0-100km/h 加速时间（秒）
@@ -39,10 +54,31 @@ class PerformanceMetrics:
     fuel_consumption: float  # 油耗（L/100km）或电耗（kWh/100km）
     emission_level: EmissionLevel
 
+# 决定规格的字段 - 每次赋值都让组件的规格版本号加一
+class SpecField:
+    """只拦截赋值：值仍存放在实例字典里，读取不经过描述符，与普通属性一样快
+    
+    同一类型的组件构造完成时版本号相同；版本号只增不减，与产品族样品一致说明规格和性能数据没有变化。
+    运行状态（温度、磨损等）是普通属性，修改它们不影响版本号，也没有额外开销。
+    """
+    
+    def __set_name__(self, owner, name: str):
+        self.name = name
+    
+    def __set__(self, instance, value):
+        fields = instance.__dict__
+        fields["spec_version"] = fields.get("spec_version", 0) + 1
+        fields[self.name] = value
+
 # 抽象产品：引擎
 class Engine(ABC):
     """引擎抽象基类"""
     
+    unit_price: float = 0.0  # 单价（万元）
+    spec_version = 0  # 规格字段被赋值的次数，由 SpecField 维护
+    power = SpecField()
+    torque = SpecField()
+    
     def __init__(self, power: int, torque: int):
         self.power = power  # 功率（马力）
         self.torque = torque  # 扭矩（牛·米）
@@ -88,6 +124,11 @@ class Engine(ABC):
 class Body(ABC):
     """车身抽象基类"""
     
+    unit_price: float = 0.0  # 单价（万元）
+    spec_version = 0
+    weight = SpecField()
+    drag_coefficient = SpecField()
+    
     def __init__(self, weight: int, drag_coefficient: float):
         self.weight = weight  # 重量（kg）
         self.drag_coefficient = drag_coefficient  # 风阻系数
@@ -117,6 +158,11 @@ class Body(ABC):
 class Tire(ABC):
     """轮胎抽象基类"""
     
+    unit_price: float = 0.0  # 单条价格（万元）
+    spec_version = 0
+    grip_coefficient = SpecField()
+    wear_resistance = SpecField()
+    
     def __init__(self, grip_coefficient: float, wear_resistance: int):
         self.grip_coefficient = grip_coefficient  # 抓地力系数
         self.wear_resistance = wear_resistance  # 耐磨指数
@@ -155,6 +201,9 @@ class Tire(ABC):
 class GasolineEngine(Engine):
     """汽油引擎"""
     
+    unit_price = 7
+    displacement = SpecField()
+    
     def __init__(self):
         super().__init__(180, 250)
         self.displacement = 2.0  # 排量（L）
@@ -200,6 +249,10 @@ class GasolineEngine(Engine):
 class ElectricEngine(Engine):
     """电动引擎"""
     
+    unit_price = 17
+    battery_capacity = SpecField()
+    efficiency = SpecField()
+    
     def __init__(self):
         super().__init__(300, 400)
         self.battery_capacity = 75.0  # 电池容量（kWh）
@@ -244,6 +297,10 @@ class ElectricEngine(Engine):
 class HybridEngine(Engine):
     """混合动力引擎"""
     
+    unit_price = 27
+    displacement = SpecField()
+    electric_power = SpecField()
+    
     def __init__(self):
         super().__init__(250, 320)
         self.displacement = 2.5  # 汽油引擎排量（L）
@@ -290,6 +347,10 @@ class HybridEngine(Engine):
 class SteelBody(Body):
     """钢制车身"""
     
+    unit_price = 3
+    material_grade = SpecField()
+    coating = SpecField()
+    
     def __init__(self):
         super().__init__(1450, 0.32)
         self.material_grade = "高强度钢"
@@ -318,6 +379,10 @@ class SteelBody(Body):
 class CarbonFiberBody(Body):
     """碳纤维车身"""
     
+    unit_price = 12
+    material_grade = SpecField()
+    coating = SpecField()
+    
     def __init__(self):
         super().__init__(980, 0.25)
         self.material_grade = "T800级碳纤维"
@@ -346,6 +411,10 @@ class CarbonFiberBody(Body):
 class StandardTire(Tire):
     """标准轮胎"""
     
+    unit_price = 0.5
+    brand = SpecField()
+    model = SpecField()
+    
     def __init__(self):
         super().__init__(0.7, 300)
         self.brand = "米其林"
@@ -371,6 +440,10 @@ class StandardTire(Tire):
 class PerformanceTire(Tire):
     """高性能轮胎"""
     
+    unit_price = 1.5
+    brand = SpecField()
+    model = SpecField()
+    
     def __init__(self):
         super().__init__(0.95, 250)
         self.brand = "倍耐力"
@@ -392,10 +465,44 @@ class PerformanceTire(Tire):
             CarSpecification("速度等级", "Y", "", "300km/h高速级别")
         ]
 
+def compute_performance_score(metrics: PerformanceMetrics) -> float:
+    """按加速、最高时速和能耗计算 0-100 的综合评分"""
+    performance_score = 100
+    performance_score -= (metrics.acceleration - 6) * 5  # 加速性能
+    performance_score += (metrics.max_speed - 150) * 0.1  # 最高速度
+    performance_score -= metrics.fuel_consumption * 2  # 燃油经济性
+    return max(0, min(100, performance_score))
+
+def component_versions(engine: Engine, body: Body, tire: Tire) -> tuple:
+    """三个组件的类型和规格版本号，只比较整数，不必逐个字段比较"""
+    return ((type(engine), engine.spec_version), (type(body), body.spec_version),
+            (type(tire), tire.spec_version))
+
+class ProductFamily(NamedTuple):
+    """同一工厂产品族共享的不可变数据：规格、性能指标和格式化好的性能汇总
+    
+    versions 记录生成这些数据的样品组件的类型和规格版本号，车辆的组件被替换成其他类型，
+    或决定规格的字段被修改后版本号不再一致，不能再使用缓存。
+    """
+    engine_specs: Tuple[CarSpecification, ...]
+    body_specs: Tuple[CarSpecification, ...]
+    tire_specs: Tuple[CarSpecification, ...]
+    metrics: PerformanceMetrics
+    performance_score: float
+    safety_rating: int
+    engine_type: EngineType
+    body_material: str
+    tire_type: str
+    summary: Tuple[Tuple[str, str], ...]
+    versions: Tuple[tuple, tuple, tuple]
+
 # 抽象工厂
 class CarFactory(ABC):
     """汽车工厂抽象基类"""
     
+    # 按工厂类缓存产品族数据；规格和性能指标只由组件类型决定，与单辆车的里程、磨损等状态无关
+    _families: Dict[type, ProductFamily] = {}
+    
     @abstractmethod
     def create_engine(self) -> Engine:
         """创建引擎"""
@@ -420,6 +527,36 @@ class CarFactory(ABC):
     def get_base_price(self) -> int:
         """获取基础价格（万元）"""
         pass
+    
+    def get_family(self) -> ProductFamily:
+        """获取产品族共享数据，第一次调用时用一套样品组件生成"""
+        family = CarFactory._families.get(type(self))
+        if family is None:
+            engine = self.create_engine()
+            body = self.create_body()
+            tire = self.create_tires()[0]
+            metrics = engine.get_performance_metrics()
+            sample = Car(engine, body, [tire] * 4, self.get_car_grade(), self.get_base_price())
+            family = ProductFamily(
+                engine_specs=tuple(engine.get_specifications()),
+                body_specs=tuple(body.get_specifications()),
+                tire_specs=tuple(tire.get_specifications()),
+                metrics=metrics,
+                performance_score=compute_performance_score(metrics),
+                safety_rating=body.get_safety_rating(),
+                engine_type=engine.get_type(),
+                body_material=body.get_material(),
+                tire_type=tire.get_type(),
+                summary=tuple(sample.get_performance_summary().items()),
+                versions=component_versions(engine, body, tire)
+            )
+            CarFactory._families[type(self)] = family
+        return family
+    
+    def create_car(self) -> "Car":
+        """组装一辆车：组件各自保存可变状态，规格和性能数据与同族车辆共享"""
+        return Car(self.create_engine(), self.create_body(), self.create_tires(),
+                   self.get_car_grade(), self.get_base_price(), family=self.get_family())
 
 # 具体工厂：经济型汽车工厂
 class EconomyCarFactory(CarFactory):
@@ -482,7 +619,8 @@ class ElectricCarFactory(CarFactory):
 class Car:
     """汽车组合类"""
     
-    def __init__(self, engine: Engine, body: Body, tires: List[Tire], car_grade: CarGrade, base_price: int):
+    def __init__(self, engine: Engine, body: Body, tires: List[Tire], car_grade: CarGrade, base_price: int,
+                 family: Optional[ProductFamily] = None):
         if len(tires) != 4:
             raise ValueError("汽车必须有4个轮胎")
         
@@ -493,6 +631,14 @@ class Car:
         self.base_price = base_price
         self.mileage = 0.0  # 里程（km）
         self.maintenance_due = False
+        self.family = family  # 由工厂 create_car 创建时共享产品族数据
+    
+    def _current_family(self) -> Optional[ProductFamily]:
+        """组件仍与产品族样品一致时返回共享数据，否则清除 family，之后改为从组件实时计算"""
+        family = self.family
+        if family is not None and family.versions != component_versions(self.engine, self.body, self.tires[0]):
+            family = self.family = None
+        return family
     
     def start_engine(self) -> str:
         """启动引擎"""
@@ -528,17 +674,27 @@ class Car:
     
     def get_full_specifications(self) -> Dict[str, List[CarSpecification]]:
         """获取完整规格"""
-        specs = {
-            "引擎": self.engine.get_specifications(),
-            "车身": self.body.get_specifications(),
-            "轮胎": self.tires[0].get_specifications()
-        }
+        family = self._current_family()
+        if family is not None:
+            specs = {
+                "引擎": list(family.engine_specs),
+                "车身": list(family.body_specs),
+                "轮胎": list(family.tire_specs)
+            }
+            safety_rating = family.safety_rating
+        else:
+            specs = {
+                "引擎": self.engine.get_specifications(),
+                "车身": self.body.get_specifications(),
+                "轮胎": self.tires[0].get_specifications()
+            }
+            safety_rating = self.body.get_safety_rating()
         
         # 添加车辆基本信息
         specs["基本信息"] = [
             CarSpecification("车型等级", self.car_grade.value, "", "车辆定位级别"),
             CarSpecification("指导价格", str(self.base_price), "万元", "厂商建议零售价"),
-            CarSpecification("安全评级", f"{self.body.get_safety_rating()}星", "", "碰撞安全评级"),
+            CarSpecification("安全评级", f"{safety_rating}星", "", "碰撞安全评级"),
             CarSpecification("总里程", f"{self.mileage:.1f}", "公里", "车辆累计行驶里程")
         ]
         
@@ -546,14 +702,13 @@ class Car:
     
     def get_performance_summary(self) -> Dict[str, any]:
         """获取性能汇总"""
+        family = self._current_family()
+        if family is not None:
+            return dict(family.summary)
         metrics = self.engine.get_performance_metrics()
         
         # 计算综合评分
-        performance_score = 100
-        performance_score -= (metrics.acceleration - 6) * 5  # 加速性能
-        performance_score += (metrics.max_speed - 150) * 0.1  # 最高速度
-        performance_score -= metrics.fuel_consumption * 2  # 燃油经济性
-        performance_score = max(0, min(100, performance_score))
+        performance_score = compute_performance_score(metrics)
         
         return {
             "加速性能": f"{metrics.acceleration}秒 (0-100km/h)",
@@ -564,19 +719,418 @@ class Car:
             "安全评级": f"{self.body.get_safety_rating()}星"
         }
     
-    def export_config(self) -> str:
-        """导出配置为JSON格式"""
-        config = {
+    def config_key(self) -> tuple:
+        """决定导出配置中除里程以外所有字段的键，键相同的车辆这部分配置完全相同"""
+        return (self.car_grade, type(self.engine), type(self.body), type(self.tires[0]), self.base_price)
+    
+    def config_template(self) -> Dict[str, any]:
+        """导出配置的模板，mileage 留空为 None"""
+        return {
             "car_grade": self.car_grade.value,
             "engine_type": self.engine.get_type().value,
             "body_material": self.body.get_material(),
             "tire_type": self.tires[0].get_type(),
             "base_price": self.base_price,
-            "mileage": self.mileage,
+            "mileage": None,
             "performance": self.get_performance_summary()
         }
+    
+    def export_config(self) -> str:
+        """导出配置为JSON格式"""
+        config = self.config_template()
+        config["mileage"] = self.mileage
         return json.dumps(config, ensure_ascii=False, indent=2)
 
+# 批量导出 - 每行一辆车的紧凑 JSON（JSON Lines），或按列存放的二进制库存文件
+def export_cars_jsonl(cars: Iterable[Car], f: TextIO) -> int:
+    """把车辆逐行写成紧凑 JSON，字段与 export_config 相同，返回写出的车辆数
+    
+    同一 config_key 的车辆只序列化一次模板，之后每辆车只拼接里程。
+    """
+    pieces: Dict[tuple, Tuple[str, str]] = {}
+    count = 0
+    for car in cars:
+        key = car.config_key()
+        piece = pieces.get(key)
+        if piece is None:
+            text = json.dumps(car.config_template(), ensure_ascii=False, separators=(",", ":"))
+            head, tail = text.split('"mileage":null', 1)
+            piece = pieces[key] = (head + '"mileage":', tail + "\n")
+        f.write(piece[0] + json.dumps(float(car.mileage)) + piece[1])
+        count += 1
+    return count
+
+def read_cars_jsonl(f: TextIO) -> Iterator[Dict[str, any]]:
+    """逐行读取 export_cars_jsonl 写出的配置"""
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+class CarInventoryFile:
+    """按列存放的汽车库存文件：由 CarInventoryFile.write 写出，通过 mmap 映射读取
+    
+    文件格式（小端）：
+        文件头  b"CARS" 版本号:H 索引宽度:B 填充:B 模板字节数:I 车辆数:Q
+        模板    配置模板列表的紧凑 JSON（UTF-8），补齐到 8 字节边界
+        里程列  车辆数 × d
+        索引列  车辆数 × H 或 I（索引宽度为 2 或 4），指向每辆车的配置模板
+    
+    每辆车只占 10 或 12 字节；里程列和索引列直接是映射页面上的视图，不需要解码整个文件。
+    """
+    MAGIC = b"CARS"
+    VERSION = 1
+    _HEADER = struct.Struct("<4sHBxIQ")
+    
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = None
+        magic, version, width, template_size, count = self._HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC or version != self.VERSION or width not in (2, 4):
+            self.close()
+            raise ValueError(f"'{path}' 不是受支持的汽车库存文件")
+        offset = self._HEADER.size
+        self.templates: List[Dict[str, any]] = json.loads(self._mm[offset:offset + template_size].decode("utf-8"))
+        offset += template_size
+        offset += -offset % 8
+        index_code = "H" if width == 2 else "I"
+        if sys.byteorder == "little":
+            self._view = memoryview(self._mm)
+            self.mileage = self._view[offset:offset + 8 * count].cast("d")
+            self.index = self._view[offset + 8 * count:offset + (8 + width) * count].cast(index_code)
+        else:
+            # 大端机器上复制一份再转换字节序
+            self.mileage = array("d", self._mm[offset:offset + 8 * count])
+            self.index = array(index_code, self._mm[offset + 8 * count:offset + (8 + width) * count])
+            self.mileage.byteswap()
+            self.index.byteswap()
+    
+    @classmethod
+    def write(cls, path: str, cars: Iterable[Car]) -> int:
+        """把车辆写成库存文件，先写临时文件再替换，返回写出的车辆数"""
+        slots: Dict[tuple, int] = {}
+        templates = []
+        mileage = array("d")
+        index = array("I")
+        for car in cars:
+            key = car.config_key()
+            slot = slots.get(key)
+            if slot is None:
+                slot = slots[key] = len(templates)
+                templates.append(car.config_template())
+            index.append(slot)
+            mileage.append(car.mileage)
+        if len(templates) <= 0xFFFF:
+            index = array("H", index)
+        if sys.byteorder != "little":
+            mileage.byteswap()
+            index.byteswap()
+        encoded = json.dumps(templates, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        padding = -(cls._HEADER.size + len(encoded)) % 8
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(cls._HEADER.pack(cls.MAGIC, cls.VERSION, index.itemsize, len(encoded), len(mileage)))
+                f.write(encoded + b"\0" * padding)
+                f.write(mileage)
+                f.write(index)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return len(mileage)
+    
+    def __len__(self) -> int:
+        return len(self.mileage)
+    
+    def __getitem__(self, i: int) -> Dict[str, any]:
+        """第 i 辆车的配置，与 json.loads(car.export_config()) 相同"""
+        config = dict(self.templates[self.index[i]])
+        config["mileage"] = self.mileage[i]
+        return config
+    
+    def __iter__(self) -> Iterator[Dict[str, any]]:
+        templates = self.templates
+        for slot, mileage in zip(self.index, self.mileage):
+            config = dict(templates[slot])
+            config["mileage"] = mileage
+            yield config
+    
+    def close(self):
+        # 映射上的视图必须先释放，mmap 才能关闭
+        if self._view is not None:
+            self.mileage.release()
+            self.index.release()
+            self._view.release()
+            self._view = None
+        self._mm.close()
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# 车队 - 按列存放整支车队的里程、轮胎磨损和保养标记，一次向量化运算驾驶所有车辆
+class Fleet:
+    """车队的列式状态，drive 的逐车语义与 Car.drive 完全一致
+    
+    wear 的形状为 (4, 车辆数)，每一行是一个轮位的磨损列；running 为 False 的车辆不会行驶。
+    """
+    
+    def __init__(self, size: int):
+        if np is None:
+            raise ImportError("Fleet 需要 NumPy，请先安装：pip install numpy")
+        self.mileage = np.zeros(size)
+        self.wear = np.zeros((4, size))
+        self.maintenance_due = np.zeros(size, dtype=bool)
+        self.running = np.ones(size, dtype=bool)
+    
+    @classmethod
+    def from_cars(cls, cars: List[Car]) -> "Fleet":
+        """从一组车辆的当前状态建立车队"""
+        fleet = cls(len(cars))
+        fleet.mileage[:] = [car.mileage for car in cars]
+        for position in range(4):
+            fleet.wear[position] = [car.tires[position].wear_level for car in cars]
+        fleet.maintenance_due[:] = [car.maintenance_due for car in cars]
+        fleet.running[:] = [car.engine.is_running for car in cars]
+        return fleet
+    
+    def __len__(self) -> int:
+        return len(self.mileage)
+    
+    def drive(self, distances) -> "np.ndarray":
+        """所有运行中的车辆各自行驶 distances 中对应的距离（也可以是一个标量），返回本次触发保养的车辆掩码"""
+        distances = np.broadcast_to(np.asarray(distances, dtype=float), self.mileage.shape)
+        moving = self.running
+        np.add(self.mileage, distances, out=self.mileage, where=moving)
+        # 每10000km磨损1%，封顶100%
+        np.minimum(self.wear + distances / 10000, 100, out=self.wear, where=moving)
+        due = moving & (self.mileage % 5000 < distances)
+        self.maintenance_due |= due
+        return due
+    
+    def write_back(self, cars: List[Car]) -> None:
+        """把车队状态写回对应的车辆对象"""
+        for i, car in enumerate(cars):
+            car.mileage = float(self.mileage[i])
+            for position, tire in enumerate(car.tires):
+                tire.wear_level = float(self.wear[position, i])
+            car.maintenance_due = bool(self.maintenance_due[i])
+
+# 评分表 - 按列存放一批车辆（或组件组合）的性能指标和评分，展示时才格式化字符串
+class PerformanceTable:
+    """批量评分结果，score 与 compute_performance_score 逐位一致
+    
+    数值列 acceleration、max_speed、fuel_consumption、score、safety 都是 NumPy 数组，
+    emission_levels 按行保存排放等级；summary(i) 返回与 Car.get_performance_summary 相同的字典。
+    """
+    
+    def __init__(self, rows: List[Tuple[PerformanceMetrics, int]]):
+        if np is None:
+            raise ImportError("PerformanceTable 需要 NumPy，请先安装：pip install numpy")
+        # 同一组 (性能指标, 安全评级) 只计算一次，再按行展开
+        unique: Dict[Tuple[PerformanceMetrics, int], int] = {}
+        index = np.fromiter((unique.setdefault(row, len(unique)) for row in rows), dtype=np.intp, count=len(rows))
+        keys = list(unique)
+        acceleration = np.array([metrics.acceleration for metrics, _ in keys], dtype=float)
+        max_speed = np.array([metrics.max_speed for metrics, _ in keys], dtype=float)
+        fuel_consumption = np.array([metrics.fuel_consumption for metrics, _ in keys], dtype=float)
+        # 与 compute_performance_score 相同的运算顺序，保证浮点结果完全一致
+        score = 100 - (acceleration - 6) * 5
+        score += (max_speed - 150) * 0.1
+        score -= fuel_consumption * 2
+        np.clip(score, 0, 100, out=score)
+        
+        self.acceleration = acceleration[index]
+        self.max_speed = max_speed[index]
+        self.fuel_consumption = fuel_consumption[index]
+        self.score = score[index]
+        self.safety = np.array([safety for _, safety in keys], dtype=np.int64)[index]
+        levels = [metrics.emission_level for metrics, _ in keys]
+        self.emission_levels = [levels[i] for i in index.tolist()]
+    
+    @classmethod
+    def from_cars(cls, cars: List[Car]) -> "PerformanceTable":
+        """从一批车辆建表：共享产品族的车辆直接取缓存指标，其余按引擎和车身类型各查询一次"""
+        lookups: Dict[Tuple[type, type], Tuple[PerformanceMetrics, int]] = {}
+        rows = []
+        for car in cars:
+            family = car._current_family()
+            if family is not None:
+                rows.append((family.metrics, family.safety_rating))
+                continue
+            key = (type(car.engine), type(car.body))
+            row = lookups.get(key)
+            if row is None:
+                row = lookups[key] = (car.engine.get_performance_metrics(), car.body.get_safety_rating())
+            rows.append(row)
+        return cls(rows)
+    
+    @classmethod
+    def from_components(cls, combinations: List[Tuple[Engine, Body, Tire]]) -> "PerformanceTable":
+        """从原始的 (引擎, 车身, 轮胎) 组合建表，无需组装 Car；轮胎不参与评分"""
+        return cls([(engine.get_performance_metrics(), body.get_safety_rating())
+                    for engine, body, _ in combinations])
+    
+    def __len__(self) -> int:
+        return len(self.score)
+    
+    def ranking(self) -> "np.ndarray":
+        """按综合评分从高到低排列的行号，评分相同时保持原顺序"""
+        return np.argsort(-self.score, kind="stable")
+    
+    def summary(self, i: int) -> Dict[str, str]:
+        """第 i 行的性能汇总，格式与 Car.get_performance_summary 相同"""
+        level = self.emission_levels[i]
+        return {
+            "加速性能": f"{self.acceleration[i].item()}秒 (0-100km/h)",
+            "最高时速": f"{int(self.max_speed[i])}km/h",
+            "能耗水平": f"{self.fuel_consumption[i].item()}{'L' if level != EmissionLevel.ZERO else 'kWh'}/100km",
+            "排放等级": level.value,
+            "综合评分": f"{self.score[i].item():.1f}/100",
+            "安全评级": f"{int(self.safety[i])}星"
+        }
+
+# 配置空间 - 枚举所有已注册的引擎/车身/轮胎组合，求价格、性能与安全的帕累托前沿
+# 默认配置空间使用的组件目录；其他组件（包括运行时生成的类）需要显式传给 ConfigurationSpace
+DEFAULT_ENGINES = (GasolineEngine, ElectricEngine, HybridEngine)
+DEFAULT_BODIES = (SteelBody, CarbonFiberBody)
+DEFAULT_TIRES = (StandardTire, PerformanceTire)
+
+class ComponentProfile(NamedTuple):
+    """单个组件类的缓存数据；metrics 只有引擎有，safety_rating 只有车身有"""
+    component: type
+    specs: Tuple[CarSpecification, ...]
+    metrics: Optional[PerformanceMetrics]
+    safety_rating: Optional[int]
+    price: float
+
+def component_profile(component: type) -> ComponentProfile:
+    """实例化一次组件类，读取它的规格、性能指标和价格"""
+    instance = component()
+    # 直接查 MRO：ABC 的 isinstance 在子类很多时要逐个扫描子类
+    return ComponentProfile(
+        component=component,
+        specs=tuple(instance.get_specifications()),
+        metrics=instance.get_performance_metrics() if Engine in component.__mro__ else None,
+        safety_rating=instance.get_safety_rating() if Body in component.__mro__ else None,
+        price=component.unit_price
+    )
+
+class Configuration(NamedTuple):
+    """一种引擎/车身/轮胎组合的评估结果，价格含四条轮胎"""
+    engine: type
+    body: type
+    tire: type
+    price: float
+    performance_score: float
+    safety_rating: int
+
+def _pareto(candidates: List[tuple], objectives: int) -> List[tuple]:
+    """candidates 的前 objectives 项都是越小越好的目标值，返回非支配的候选
+    
+    支配指所有目标都不更差且至少一个目标更好，目标值完全相同的候选互不支配，全部保留。
+    按元组排序后扫描：排在前面的候选第一个目标不会更差，只需比较其余目标，再排除目标值完全相同的情况。
+    """
+    front = []
+    for candidate in sorted(candidates):
+        goals, rest = candidate[:objectives], candidate[1:objectives]
+        if not any(all(f <= c for f, c in zip(kept[1:objectives], rest)) and kept[:objectives] != goals
+                   for kept in front):
+            front.append(candidate)
+    return front
+
+def _pareto_chunk(task: tuple) -> List[tuple]:
+    """工作进程：评估 engines[start:stop] 与所有车身、轮胎的组合，返回这一块的帕累托前沿
+    
+    候选为 (价格, -评分, -安全评级, 引擎序号, 车身序号, 轮胎序号)，只传数值，不需要序列化组件类。
+    """
+    engines, bodies, tires, start, stop = task
+    front: List[tuple] = []
+    for e in range(start, stop):
+        engine_price, score = engines[e]
+        candidates = [(engine_price + body_price + 4 * tire_price, -score, -safety, e, b, t)
+                      for b, (body_price, safety) in enumerate(bodies)
+                      for t, tire_price in enumerate(tires)]
+        front = _pareto(front + candidates, 3)
+    return front
+
+class ConfigurationSpace:
+    """所有引擎 × 车身 × 轮胎组合；默认使用 DEFAULT_ENGINES/DEFAULT_BODIES/DEFAULT_TIRES 目录
+    
+    组件数据按空间各自缓存，空间释放后缓存和其中引用的组件类一起释放。
+    
+    评分只取决于引擎、安全评级只取决于车身、价格是各组件价格之和，所以 prune=True 时
+    先在每个槽位内去掉被支配的组件，再交叉组合，得到的前沿与完整枚举相同。
+    """
+    
+    def __init__(self, engines: Optional[List[type]] = None, bodies: Optional[List[type]] = None,
+                 tires: Optional[List[type]] = None):
+        self.engines = list(engines if engines is not None else DEFAULT_ENGINES)
+        self.bodies = list(bodies if bodies is not None else DEFAULT_BODIES)
+        self.tires = list(tires if tires is not None else DEFAULT_TIRES)
+        self._profiles: Dict[type, ComponentProfile] = {}
+    
+    def profile(self, component: type) -> ComponentProfile:
+        """组件类的缓存数据，第一次用到时才实例化"""
+        profile = self._profiles.get(component)
+        if profile is None:
+            profile = self._profiles[component] = component_profile(component)
+        return profile
+    
+    def __len__(self) -> int:
+        return len(self.engines) * len(self.bodies) * len(self.tires)
+    
+    def evaluate(self, engine: type, body: type, tire: type) -> Configuration:
+        """评估单个组合，组件数据来自缓存"""
+        engine_profile = self.profile(engine)
+        body_profile = self.profile(body)
+        tire_price = self.profile(tire).price
+        return Configuration(
+            engine=engine,
+            body=body,
+            tire=tire,
+            price=engine_profile.price + body_profile.price + 4 * tire_price,
+            performance_score=compute_performance_score(engine_profile.metrics),
+            safety_rating=body_profile.safety_rating
+        )
+    
+    def pareto_front(self, workers: Optional[int] = None, prune: bool = True,
+                     chunk_size: int = 16) -> List[Configuration]:
+        """价格越低、评分和安全评级越高越好的非支配组合，按价格升序
+        
+        引擎按 chunk_size 分块交给进程池评估，workers=1 时在当前进程执行。
+        """
+        profile = self.profile
+        engines = [(c, profile(c).price, compute_performance_score(profile(c).metrics)) for c in self.engines]
+        bodies = [(c, profile(c).price, profile(c).safety_rating) for c in self.bodies]
+        tires = [(c, profile(c).price) for c in self.tires]
+        if prune:
+            engines = [(c, price, -negated) for price, negated, _, c in
+                       _pareto([(price, -score, i, c) for i, (c, price, score) in enumerate(engines)], 2)]
+            bodies = [(c, price, -negated) for price, negated, _, c in
+                      _pareto([(price, -safety, i, c) for i, (c, price, safety) in enumerate(bodies)], 2)]
+            tires = [(c, price) for price, _, c in _pareto([(price, i, c) for i, (c, price) in enumerate(tires)], 1)]
+        
+        engine_values = [(price, score) for _, price, score in engines]
+        body_values = [(price, safety) for _, price, safety in bodies]
+        tire_values = [price for _, price in tires]
+        tasks = [(engine_values, body_values, tire_values, start, min(start + chunk_size, len(engines)))
+                 for start in range(0, len(engines), chunk_size)]
+        if workers == 1:
+            fronts = [_pareto_chunk(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                fronts = list(pool.map(_pareto_chunk, tasks))
+        front = _pareto([candidate for chunk in fronts for candidate in chunk], 3)
+        return [Configuration(engines[e][0], bodies[b][0], tires[t][0], price, -negated_score, -negated_safety)
+                for price, negated_score, negated_safety, e, b, t in front]
+
 # 客户端代码
 def create_and_test_car(factory: CarFactory) -> None:
     """创建并测试汽车"""
@@ -586,14 +1140,8 @@ def create_and_test_car(factory: CarFactory) -> None:
     print(f"{'='*70}")
     
     try:
-        # 创建汽车组件
-        engine = factory.create_engine()
-        body = factory.create_body()
-        tires = factory.create_tires()
-        base_price = factory.get_base_price()
-        
-        # 组装汽车
-        car = Car(engine, body, tires, car_grade, base_price)
+        # 创建汽车组件并组装，规格和性能数据与同族车辆共享
+        car = factory.create_car()
         
         # 显示详细规格
         print(f"\n📋 {car_grade.value} 详细规格：")
@@ -644,6 +1192,275 @@ def create_and_test_car(factory: CarFactory) -> None:
     except Exception as e:
         print(f"❌ 未知错误：{e}")
 
+def benchmark_build_cars(n: int = 1000000):
+    """每个工厂各造 n/3 辆车并读取规格和性能汇总：逐辆重建 vs 产品族缓存"""
+    factories = [EconomyCarFactory(), LuxuryCarFactory(), ElectricCarFactory()]
+    per_factory = n // len(factories)
+    
+    def build_uncached(factory):
+        car = Car(factory.create_engine(), factory.create_body(), factory.create_tires(),
+                  factory.get_car_grade(), factory.get_base_price())
+        car.get_full_specifications()
+        car.get_performance_summary()
+        return car
+    
+    def build_cached(factory):
+        car = factory.create_car()
+        car.get_full_specifications()
+        car.get_performance_summary()
+        return car
+    
+    print(f"\n🏁 构建 {per_factory * len(factories)} 辆车并读取规格/性能汇总：")
+    results = {}
+    for label, build in (("逐辆重建", build_uncached), ("产品族缓存", build_cached)):
+        # 大量分配期间暂停分代 GC，两种方式条件相同
+        gc.disable()
+        start = time.perf_counter()
+        cars = [build(factory) for factory in factories for _ in range(per_factory)]
+        elapsed = time.perf_counter() - start
+        gc.enable()
+        results[label] = cars
+        print(f"  {label}: {elapsed:.2f} s, 每辆 {elapsed / len(cars) * 1e6:.2f} µs")
+    
+    # 共享的只是不可变数据，每辆车的里程和轮胎磨损仍然独立
+    first, second = results["产品族缓存"][0], results["产品族缓存"][1]
+    first.start_engine()
+    first.drive(6000.0)
+    independent = second.mileage == 0.0 and second.tires[0].wear_level == 0 and first.family is second.family
+    same = all(
+        a.get_full_specifications() == b.get_full_specifications()
+        and a.get_performance_summary() == b.get_performance_summary()
+        for a, b in zip(results["逐辆重建"][1::per_factory // 3], results["产品族缓存"][1::per_factory // 3]))
+    print(f"  规格与汇总一致: {same}, 单车状态独立: {independent}")
+
+def check_fleet_equivalence(cars_count: int = 600, trips: int = 300) -> bool:
+    """随机行程下 Fleet.drive 与逐辆 Car.drive 的里程、磨损和保养标记逐位一致"""
+    rng = random.Random(7)
+    factories = [EconomyCarFactory(), LuxuryCarFactory(), ElectricCarFactory()]
+    cars = [factories[i % 3].create_car() for i in range(cars_count)]
+    for car in cars:
+        if rng.random() < 0.8:  # 留一部分车辆不启动
+            car.start_engine()
+    fleet = Fleet.from_cars(cars)
+    for _ in range(trips):
+        distances = [rng.uniform(0, 8000) for _ in cars]  # 足够长，磨损会触到 100% 上限
+        for car, distance in zip(cars, distances):
+            car.drive(distance)
+        fleet.drive(np.array(distances))
+    return (fleet.mileage.tolist() == [car.mileage for car in cars]
+            and all(fleet.wear[p].tolist() == [car.tires[p].wear_level for car in cars] for p in range(4))
+            and fleet.maintenance_due.tolist() == [car.maintenance_due for car in cars])
+
+def benchmark_fleet(size: int = 100000, trips: int = 1000, loop_trips: int = 5):
+    """10 万辆车的车队：逐辆 Car.drive 与 Fleet 向量化驾驶的单次行程耗时"""
+    factory = EconomyCarFactory()
+    cars = [factory.create_car() for _ in range(size)]
+    for car in cars:
+        car.start_engine()
+    rng = np.random.default_rng(7)
+    
+    start = time.perf_counter()
+    for _ in range(loop_trips):
+        distances = rng.uniform(0, 300, size).tolist()
+        for car, distance in zip(cars, distances):
+            car.drive(distance)
+    loop_time = (time.perf_counter() - start) / loop_trips
+    
+    fleet = Fleet.from_cars(cars)
+    start = time.perf_counter()
+    for _ in range(trips):
+        fleet.drive(rng.uniform(0, 300, size))
+    fleet_time = (time.perf_counter() - start) / trips
+    print(f"\n🚚 {size} 辆车的车队：逐辆驾驶 {loop_time * 1000:.1f} ms/次行程，"
+          f"向量化 {fleet_time * 1000:.2f} ms/次行程（{trips} 次行程），"
+          f"需保养 {int(fleet.maintenance_due.sum())} 辆")
+
+def check_performance_table(cars_count: int = 3000) -> bool:
+    """PerformanceTable 的评分、数值列和格式化汇总与逐辆计算的结果完全一致"""
+    factories = [EconomyCarFactory(), LuxuryCarFactory(), ElectricCarFactory()]
+    cached = [factories[i % 3].create_car() for i in range(cars_count)]
+    # 不带产品族的车辆走逐辆查询的路径
+    uncached = [Car(f.create_engine(), f.create_body(), f.create_tires(), f.get_car_grade(), f.get_base_price())
+                for f in factories]
+    cars = cached + uncached
+    table = PerformanceTable.from_cars(cars)
+    metrics = [car.engine.get_performance_metrics() for car in cars]
+    combos = PerformanceTable.from_components([(car.engine, car.body, car.tires[0]) for car in uncached])
+    return (table.score.tolist() == [compute_performance_score(m) for m in metrics]
+            and table.max_speed.tolist() == [m.max_speed for m in metrics]
+            and table.fuel_consumption.tolist() == [m.fuel_consumption for m in metrics]
+            and table.safety.tolist() == [car.body.get_safety_rating() for car in cars]
+            and all(table.summary(i) == car.get_performance_summary() for i, car in enumerate(cars))
+            and combos.score.tolist() == table.score[cars_count:].tolist())
+
+def benchmark_scoring(n: int = 300000):
+    """为 n 种配置打分并排名：逐辆 get_performance_summary 与 PerformanceTable 列式计算"""
+    factories = [EconomyCarFactory(), LuxuryCarFactory(), ElectricCarFactory()]
+    # 不带产品族的车辆，get_performance_summary 每次都重新计算评分和格式化字符串
+    cars = [Car(f.create_engine(), f.create_body(), f.create_tires(), f.get_car_grade(), f.get_base_price())
+            for f in factories for _ in range(n // len(factories))]
+    
+    start = time.perf_counter()
+    summaries = [car.get_performance_summary() for car in cars]
+    order = sorted(range(len(cars)), key=lambda i: -float(summaries[i]["综合评分"].split("/")[0]))
+    loop_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    table = PerformanceTable.from_cars(cars)
+    ranking = table.ranking()
+    table_time = time.perf_counter() - start
+    
+    print(f"\n📈 为 {len(cars)} 种配置打分排名：逐辆汇总 {loop_time:.2f} s，"
+          f"列式评分 {table_time:.2f} s，最高分 {table.summary(int(ranking[0]))['综合评分']}，"
+          f"前 10 名一致: {[summaries[i] for i in order[:10]] == [table.summary(int(i)) for i in ranking[:10]]}")
+
+def synthetic_catalogue(size: int, seed: int = 7) -> Tuple[List[type], List[type], List[type]]:
+    """生成每个槽位 size 个随机参数的合成组件类，用于配置空间的基准测试"""
+    rng = random.Random(seed)
+    engines, bodies, tires = [], [], []
+    for i in range(size):
+        metrics = PerformanceMetrics(
+            acceleration=round(rng.uniform(3.0, 12.0), 1),
+            max_speed=rng.randrange(140, 320),
+            fuel_consumption=round(rng.uniform(3.0, 20.0), 1),
+            emission_level=rng.choice(list(EmissionLevel))
+        )
+        engines.append(type(f"SyntheticEngine{i}", (GasolineEngine,), {
+            "unit_price": round(rng.uniform(5, 40), 1),
+            "get_performance_metrics": lambda self, metrics=metrics: metrics
+        }))
+        safety = rng.randint(1, 5)
+        bodies.append(type(f"SyntheticBody{i}", (SteelBody,), {
+            "unit_price": round(rng.uniform(2, 15), 1),
+            "get_safety_rating": lambda self, safety=safety: safety
+        }))
+        tires.append(type(f"SyntheticTire{i}", (StandardTire,), {"unit_price": round(rng.uniform(0.3, 2.0), 2)}))
+    return engines, bodies, tires
+
+def _objectives(front: List[Configuration]) -> List[Tuple[float, float, int]]:
+    return sorted((c.price, c.performance_score, c.safety_rating) for c in front)
+
+def check_configuration_space() -> bool:
+    """已注册组件的配置空间：逐个评估与 Car 一致，剪枝、完整枚举和进程池得到相同的前沿"""
+    space = ConfigurationSpace()
+    for factory in (EconomyCarFactory(), LuxuryCarFactory(), ElectricCarFactory()):
+        car = factory.create_car()
+        config = space.evaluate(type(car.engine), type(car.body), type(car.tires[0]))
+        if (config.price != factory.get_base_price()
+                or config.performance_score != factory.get_family().performance_score
+                or config.safety_rating != factory.get_family().safety_rating):
+            return False
+    front = _objectives(space.pareto_front(workers=1, prune=False))
+    # 暴力枚举所有组合作为参照
+    every = [space.evaluate(e, b, t) for e in space.engines for b in space.bodies for t in space.tires]
+    expected = sorted((c.price, c.performance_score, c.safety_rating) for c in every
+                      if not any(o.price <= c.price and o.performance_score >= c.performance_score
+                                 and o.safety_rating >= c.safety_rating
+                                 and (o.price, o.performance_score, o.safety_rating)
+                                 != (c.price, c.performance_score, c.safety_rating) for o in every))
+    return front == expected == _objectives(space.pareto_front(workers=1)) == _objectives(space.pareto_front(workers=2))
+
+def benchmark_configuration_space(size: int = 1000, workers: Optional[int] = None):
+    """每个槽位 size 个合成组件：组件缓存、完整枚举（串行/进程池）与槽位剪枝的耗时"""
+    engines, bodies, tires = synthetic_catalogue(size)
+    space = ConfigurationSpace(engines, bodies, tires)
+    
+    start = time.perf_counter()
+    for component in engines + bodies + tires:
+        space.profile(component)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    for component in engines + bodies + tires:
+        space.profile(component)
+    warm = time.perf_counter() - start
+    print(f"\n🧩 {3 * size} 个组件的规格与指标：首次 {cold * 1000:.1f} ms，缓存命中 {warm * 1000:.2f} ms")
+    
+    # 完整枚举 size^3 种组合不现实，用缩小的车身/轮胎目录比较串行与进程池；先填好缓存，计时只含求解
+    subset = ConfigurationSpace(engines, bodies[:size // 10], tires[:size // 100])
+    for component in subset.engines + subset.bodies + subset.tires:
+        subset.profile(component)
+    timings = {}
+    fronts = {}
+    for label, kwargs in (("完整枚举·串行", {"workers": 1, "prune": False}),
+                          ("完整枚举·进程池", {"workers": workers, "prune": False}),
+                          ("槽位剪枝", {"workers": 1})):
+        start = time.perf_counter()
+        fronts[label] = _objectives(subset.pareto_front(**kwargs))
+        timings[label] = time.perf_counter() - start
+    print(f"  {len(subset)} 种组合：" + "，".join(f"{label} {seconds:.2f} s" for label, seconds in timings.items())
+          + f"，前沿一致: {len(set(map(tuple, fronts.values()))) == 1}")
+    
+    start = time.perf_counter()
+    front = space.pareto_front(workers=workers)
+    elapsed = time.perf_counter() - start
+    print(f"  完整目录 {len(space)} 种组合：剪枝 + 进程池 {elapsed:.2f} s，帕累托前沿 {len(front)} 个配置")
+
+def _inventory(n: int, seed: int = 7) -> List[Car]:
+    """三个工厂轮流造出 n 辆车，里程随机"""
+    rng = random.Random(seed)
+    factories = [EconomyCarFactory(), LuxuryCarFactory(), ElectricCarFactory()]
+    cars = [factories[i % 3].create_car() for i in range(n)]
+    for car in cars:
+        car.mileage = rng.uniform(0, 300000)
+    return cars
+
+def check_inventory_round_trip(n: int = 3000) -> bool:
+    """JSON Lines 和二进制库存文件读回的配置都与 json.loads(car.export_config()) 相同"""
+    cars = _inventory(n)
+    # 不带产品族的车辆走逐辆计算性能汇总的路径
+    cars += [Car(f.create_engine(), f.create_body(), f.create_tires(), f.get_car_grade(), f.get_base_price())
+             for f in (EconomyCarFactory(), ElectricCarFactory())]
+    expected = [json.loads(car.export_config()) for car in cars]
+    with tempfile.TemporaryDirectory() as directory:
+        jsonl_path = os.path.join(directory, "cars.jsonl")
+        with open(jsonl_path, "w", encoding="utf-8") as f:
+            export_cars_jsonl(cars, f)
+        with open(jsonl_path, encoding="utf-8") as f:
+            from_jsonl = list(read_cars_jsonl(f))
+        binary_path = os.path.join(directory, "cars.bin")
+        CarInventoryFile.write(binary_path, cars)
+        with CarInventoryFile(binary_path) as inventory:
+            from_binary = list(inventory)
+            random_access = inventory[n // 2] == expected[n // 2] and inventory[-1] == expected[-1]
+    return from_jsonl == expected and from_binary == expected and random_access
+
+def benchmark_inventory_export(n: int = 1000000):
+    """导出 n 辆车：逐辆 export_config、JSON Lines 和二进制库存文件的耗时与文件大小"""
+    cars = _inventory(n)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {label: os.path.join(directory, name) for label, name in
+                 (("逐辆 export_config", "cars.json"), ("JSON Lines", "cars.jsonl"), ("列式二进制", "cars.bin"))}
+        timings = {}
+        
+        start = time.perf_counter()
+        with open(paths["逐辆 export_config"], "w", encoding="utf-8") as f:
+            for car in cars:
+                f.write(car.export_config())
+                f.write("\n")
+        timings["逐辆 export_config"] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        with open(paths["JSON Lines"], "w", encoding="utf-8") as f:
+            export_cars_jsonl(cars, f)
+        timings["JSON Lines"] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        CarInventoryFile.write(paths["列式二进制"], cars)
+        timings["列式二进制"] = time.perf_counter() - start
+        
+        print(f"\n📦 导出 {n} 辆车：")
+        for label, path in paths.items():
+            size = os.path.getsize(path)
+            print(f"  {label}: {timings[label]:.2f} s（{n / timings[label]:,.0f} 辆/秒），"
+                  f"{size / 2**20:.1f} MiB，每辆 {size / n:.1f} 字节")
+        
+        start = time.perf_counter()
+        with CarInventoryFile(paths["列式二进制"]) as inventory:
+            total = sum(inventory.mileage)
+            opened = time.perf_counter() - start
+        print(f"  映射读取并汇总里程 {opened * 1000:.1f} ms，总里程 {total:,.0f} 公里，"
+              f"与对象一致: {total == sum(car.mileage for car in cars)}")
+
 # 使用示例
 if __name__ == "__main__":
     print("🚗 汽车制造工厂抽象工厂模式演示")
@@ -666,4 +1483,25 @@ if __name__ == "__main__":
     print("💡 注意：同一工厂创建的组件保持了设计理念和性能等级的一致性。")
     print("🔧 提示：车辆具有里程记录、保养提醒等实用功能。")
     print("📊 特色：提供详细的性能指标和规格信息。")
-    print(f"{'='*70}") 
\ No newline at end of file
+    print(f"{'='*70}")
+    
+    # 以下校验与性能对比耗时较长，需加 --benchmark 运行
+    if "--benchmark" in sys.argv[1:]:
+        benchmark_build_cars()
+        
+        print(f"\n🧩 配置空间枚举与暴力搜索一致：{check_configuration_space()}")
+        for config in ConfigurationSpace().pareto_front():
+            print(f"  {config.engine.__name__} + {config.body.__name__} + {config.tire.__name__}："
+                  f"{config.price:g}万元，评分 {config.performance_score:.1f}，安全 {config.safety_rating}星")
+        benchmark_configuration_space()
+        
+        print(f"\n📦 JSON Lines 与二进制库存文件往返一致：{check_inventory_round_trip()}")
+        benchmark_inventory_export()
+        
+        if np is not None:
+            print(f"\n🚚 Fleet 与 Car.drive 结果一致：{check_fleet_equivalence()}")
+            benchmark_fleet()
+            print(f"\n📈 PerformanceTable 与 get_performance_summary 结果一致：{check_performance_table()}")
+            benchmark_scoring()
+        else:
+            print("\n🚚 未安装 NumPy，跳过车队向量化和批量评分演示") 
\ No newline at end of file